@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import collections
+import concurrent.futures
 import functools
 import logging
+import multiprocessing
+import os
 import random
 import secrets
+import threading
 import warnings
 from argparse import Namespace
 from collections import Counter, deque, defaultdict
@@ -79,6 +83,8 @@ class MultiWorld():
     is_race: bool = False
     precollected_items: Dict[int, List[Item]]
     state: CollectionState
+    sphere_cache: Optional[SphereCache] = None
+    """Spheres shared by post-fill consumers, see :meth:`cache_spheres`"""
 
     plando_options: PlandoOptions
     early_items: Dict[int, Dict[str, int]]
@@ -590,15 +596,21 @@ class MultiWorld():
         locations is followed by an empty set, and then a set of all of the
         unreachable locations.
         """
+        if self.sphere_cache:
+            spheres, _, unreachable = self.sphere_cache.get_spheres()
+            for sphere in spheres:
+                yield set(sphere)
+            if unreachable:
+                yield set()
+                yield set(unreachable)
+            return
+
         state = CollectionState(self)
+        frontier = SphereFrontier(state)
         locations = set(self.get_filled_locations())
 
         while locations:
-            sphere: Set[Location] = set()
-
-            for location in locations:
-                if location.can_reach(state):
-                    sphere.add(location)
+            sphere = frontier.get_reachable(locations)
             yield sphere
             if not sphere:
                 if locations:
@@ -617,6 +629,7 @@ class MultiWorld():
         and then a set of all of the unreachable locations.
         """
         state = CollectionState(self)
+        frontier = SphereFrontier(state)
         locations: Set[Location] = set()
         events: Set[Location] = set()
         for location in self.get_filled_locations():
@@ -626,22 +639,16 @@ class MultiWorld():
                 events.add(location)
 
         while locations:
-            sphere: Set[Location] = set()
-
             # cull events out
-            done_events: Set[Union[Location, None]] = {None}
-            while done_events:
-                done_events = set()
-                for event in events:
-                    if event.can_reach(state):
-                        state.collect(event.item, True, event)
-                        done_events.add(event)
+            while True:
+                done_events = frontier.get_reachable(events)
+                if not done_events:
+                    break
+                for event in done_events:
+                    state.collect(event.item, True, event)
                 events -= done_events
 
-            for location in locations:
-                if location.can_reach(state):
-                    sphere.add(location)
-
+            sphere = frontier.get_reachable(locations)
             yield sphere
             if not sphere:
                 if locations:
@@ -654,6 +661,7 @@ class MultiWorld():
 
     def fulfills_accessibility(self, state: Optional[CollectionState] = None):
         """Check if accessibility rules are fulfilled with current or supplied state."""
+        use_sphere_cache = not state and self.sphere_cache
         if not state:
             state = CollectionState(self)
         players: Dict[str, Set[int]] = {
@@ -685,11 +693,30 @@ class MultiWorld():
 
         locations = [location for location in self.get_locations() if location_relevant(location)]
 
+        if use_sphere_cache:
+            # everything reachable is already known, so only the final state has to be checked
+            spheres, states, unreachable = self.sphere_cache.get_spheres()
+            if states:
+                state = states[-1].copy()
+            reached = set().union(*spheres)
+            relevant_count = len(locations)
+            locations = [location for location in locations if location not in reached and
+                         (location in unreachable or not location.can_reach(state))]
+            if len(locations) < relevant_count:
+                beatable_fulfilled = self.has_beaten_game(state)
+                if all_done():
+                    return True
+            if not locations:
+                return False
+
+        frontier = SphereFrontier(state)
         while locations:
             sphere: List[Location] = []
-            for n in range(len(locations) - 1, -1, -1):
-                if locations[n].can_reach(state):
-                    sphere.append(locations.pop(n))
+            if not use_sphere_cache:
+                reachable = frontier.get_reachable(locations)
+                for n in range(len(locations) - 1, -1, -1):
+                    if locations[n] in reachable:
+                        sphere.append(locations.pop(n))
 
             if not sphere:
                 if __debug__:
@@ -715,6 +742,178 @@ class MultiWorld():
 
         return False
 
+    def cache_spheres(self) -> None:
+        """
+        Share collection spheres between :meth:`get_spheres`, :meth:`fulfills_accessibility` and
+        :meth:`Spoiler.create_playthrough`, instead of each of them sweeping from scratch. Spheres are computed on first
+        use and recomputed if items move afterwards.
+        """
+        if not self.sphere_cache:
+            self.sphere_cache = SphereCache(self)
+
+
+class SphereCache:
+    """Collection spheres of all filled locations, computed once per item placement."""
+    multiworld: MultiWorld
+    lock: threading.Lock
+    placed_items: List[Optional[Item]]
+    precollected_items: List[Item]
+    spheres: List[Set[Location]]
+    """reachable locations, by sphere"""
+    states: List[CollectionState]
+    """state after collecting each sphere, must not be modified by users of the cache"""
+    unreachable: Set[Location]
+
+    def __init__(self, multiworld: MultiWorld) -> None:
+        self.multiworld = multiworld
+        self.lock = threading.Lock()
+        self.placed_items = []
+        self.precollected_items = []
+        self.spheres = []
+        self.states = []
+        self.unreachable = set()
+        self.valid = False
+
+    def get_spheres(self) -> Tuple[List[Set[Location]], List[CollectionState], Set[Location]]:
+        with self.lock:
+            self.update()
+            return self.spheres, self.states, self.unreachable
+
+    def update(self) -> None:
+        """Recompute spheres if any item moved since they were last computed. Requires the lock to be held."""
+        placed_items = [location.item for location in self.multiworld.get_locations()]
+        precollected_items = [item for items in self.multiworld.precollected_items.values() for item in items]
+        if (self.valid and list(map(id, placed_items)) == list(map(id, self.placed_items))
+                and list(map(id, precollected_items)) == list(map(id, self.precollected_items))):
+            return
+
+        state = CollectionState(self.multiworld)
+        frontier = SphereFrontier(state)
+        locations = set(self.multiworld.get_filled_locations())
+        spheres: List[Set[Location]] = []
+        states: List[CollectionState] = []
+        while locations:
+            sphere = frontier.get_reachable(locations)
+            if not sphere:
+                break
+
+            for location in sphere:
+                state.collect(location.item, True, location)
+            locations -= sphere
+            spheres.append(sphere)
+            states.append(state.copy())
+
+        # keep the items referenced, so their ids stay unique while compared against
+        self.placed_items = placed_items
+        self.precollected_items = precollected_items
+        self.spheres = spheres
+        self.states = states
+        self.unreachable = locations
+        self.valid = True
+
+
+class SphereFrontier:
+    """
+    Finds reachable locations for a CollectionState that only gains items, for repeated sphere searches.
+    Locations that were unreachable on a previous search are only tested again if their region was newly reached or
+    an item or region their rule builder rule depends on changed. Locations with any other rule are always tested.
+    """
+    state: CollectionState
+    waiting: Dict[int, Set[Location]]
+    """per player, locations that were unreachable when last tested and have known dependencies"""
+    known_dependencies: Dict[Location, bool]
+    item_dependents: Dict[int, Dict[str, Set[Location]]]
+    region_dependents: Dict[int, Dict[str, Set[Location]]]
+    prog_items: Dict[int, Counter[str]]
+    """items of the state when last searched"""
+    reachable_regions: Dict[int, Set[Region]]
+    """reachable regions of the state when last searched, for players with waiting locations"""
+
+    def __init__(self, state: CollectionState) -> None:
+        self.state = state
+        self.waiting = {}
+        self.known_dependencies = {}
+        self.item_dependents = {}
+        self.region_dependents = {}
+        self.prog_items = {player: items.copy() for player, items in state.prog_items.items()}
+        self.reachable_regions = {}
+
+    def has_known_dependencies(self, location: Location) -> bool:
+        known = self.known_dependencies.get(location)
+        if known is None:
+            from rule_builder.rules import Rule
+
+            rule = location.access_rule
+            world = self.state.multiworld.worlds[location.player]
+            # dependencies are only complete if the rule builder's own caching relies on them
+            known = (isinstance(rule, Rule.Resolved) and getattr(world, "rule_caching_enabled", False)
+                     and not rule.force_recalculate
+                     and not rule.location_dependencies() and not rule.entrance_dependencies()
+                     and type(location).can_reach is Location.can_reach
+                     and location.parent_region is not None
+                     and type(location.parent_region).can_reach is Region.can_reach)
+            if known:
+                item_dependents = self.item_dependents.setdefault(location.player, {})
+                for item_name in rule.item_dependencies():
+                    item_dependents.setdefault(item_name, set()).add(location)
+                region_dependents = self.region_dependents.setdefault(location.player, {})
+                for region_name in rule.region_dependencies():
+                    region_dependents.setdefault(region_name, set()).add(location)
+            self.known_dependencies[location] = known
+        return known
+
+    def update(self) -> None:
+        """Wake up waiting locations affected by changes to the state since the last search."""
+        state = self.state
+        for player, items in state.prog_items.items():
+            old_items = self.prog_items[player]
+            if items == old_items:
+                continue
+            self.prog_items[player] = items.copy()
+            if any(items[item_name] < count for item_name, count in old_items.items()):
+                # items were removed, so nothing known can be trusted anymore
+                self.waiting.clear()
+                self.reachable_regions.clear()
+                continue
+            waiting = self.waiting.get(player)
+            if waiting:
+                item_dependents = self.item_dependents[player]
+                for item_name, count in items.items():
+                    if count != old_items[item_name] and item_name in item_dependents:
+                        waiting.difference_update(item_dependents[item_name])
+
+        for player, known_regions in self.reachable_regions.items():
+            if state.stale[player]:
+                state.update_reachable_regions(player)
+            regions = state.reachable_regions[player]
+            if len(regions) == len(known_regions):
+                continue
+            new_regions = regions - known_regions
+            known_regions |= new_regions
+            waiting = self.waiting[player]
+            region_dependents = self.region_dependents[player]
+            for region in new_regions:
+                waiting.difference_update(region.locations)
+                if region.name in region_dependents:
+                    waiting.difference_update(region_dependents[region.name])
+
+    def get_reachable(self, locations: Iterable[Location]) -> Set[Location]:
+        """Returns the given locations that are reachable with the current state."""
+        self.update()
+        state = self.state
+        reachable: Set[Location] = set()
+        for location in locations:
+            waiting = self.waiting.get(location.player)
+            if waiting and location in waiting:
+                continue
+            if location.can_reach(state):
+                reachable.add(location)
+            elif self.has_known_dependencies(location):
+                if location.player not in self.reachable_regions:
+                    self.reachable_regions[location.player] = state.reachable_regions[location.player].copy()
+                self.waiting.setdefault(location.player, set()).add(location)
+        return reachable
+
 
 PathValue = Tuple[str, Optional["PathValue"]]
 
@@ -1675,6 +1874,38 @@ class EntranceInfo(TypedDict, total=False):
     direction: str
 
 
+def _sweep_to_goal(multiworld: MultiWorld, starting_state: Optional[CollectionState],
+                   locations: Iterable[Location]) -> Optional[Set[Location]]:
+    """
+    Like :meth:`MultiWorld.can_beat_game`, but returns the locations swept until the game was beaten,
+    or None if it can't be beaten.
+    """
+    state = starting_state.copy() if starting_state else CollectionState(multiworld)
+    if multiworld.has_beaten_game(state):
+        return set()
+    checked_locations = state.locations_checked.copy()
+    for _ in state.sweep_for_advancements(locations, yield_each_sweep=True, checked_locations=state.locations_checked):
+        if multiworld.has_beaten_game(state):
+            return state.locations_checked - checked_locations
+    return None
+
+
+_playthrough_culling: Optional[Tuple[MultiWorld, List[Optional[CollectionState]], List[Location]]] = None
+"""multiworld, state cache and required locations of the playthrough being culled, inherited by forked workers"""
+
+
+def _sweep_to_goal_without(num: int, removed: List[int]) -> Optional[List[int]]:
+    """Playthrough culling worker, :func:`_sweep_to_goal` from sphere num without the removed required locations."""
+    assert _playthrough_culling, "playthrough culling worker was not forked by Spoiler.create_playthrough"
+    multiworld, state_cache, locations = _playthrough_culling
+    removed_locations = {locations[index] for index in removed}
+    swept = _sweep_to_goal(multiworld, state_cache[num],
+                           {location for location in locations if location not in removed_locations})
+    if swept is None:
+        return None
+    return [index for index, location in enumerate(locations) if location in swept]
+
+
 class Spoiler:
     multiworld: MultiWorld
     hashes: Dict[int, str]
@@ -1699,8 +1930,15 @@ class Spoiler:
             self.entrances[(entrance, direction, player)] = \
                 {"player": player, "entrance": entrance, "exit": exit_, "direction": direction}
 
-    def create_playthrough(self, create_paths: bool = True) -> None:
-        """Destructive to the multiworld while it is run, damage gets repaired afterwards."""
+    def create_playthrough(self, create_paths: bool = True, processes: int = 1) -> None:
+        """
+        Destructive to the multiworld while it is run, damage gets repaired afterwards.
+
+        :param create_paths: Also create the paths to each required location.
+        :param processes: Number of forked worker processes to cull the playthrough with, 0 to pick based on CPU cores.
+        Only used where fork is available.
+        """
+        global _playthrough_culling
         from itertools import chain
         # get locations containing progress items
         multiworld = self.multiworld
@@ -1709,20 +1947,31 @@ class Spoiler:
         collection_spheres: List[Set[Location]] = []
         state = CollectionState(multiworld)
         sphere_candidates = set(prog_locations)
+        # spheres of all filled locations are the progress spheres plus items that don't change the state
+        cached_spheres, cached_states, _ = multiworld.sphere_cache.get_spheres() if multiworld.sphere_cache \
+            else (None, None, None)
         logging.debug('Building up collection spheres.')
         while sphere_candidates:
 
             # build up spheres of collection radius.
             # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
 
-            sphere = {location for location in sphere_candidates if state.can_reach(location)}
+            if cached_spheres is not None:
+                sphere_index = len(collection_spheres)
+                sphere = cached_spheres[sphere_index] & sphere_candidates \
+                    if sphere_index < len(cached_spheres) else set()
+                # cached states are shared, only the state checked for beatability below gets copied
+                state = cached_states[sphere_index] if sphere else state.copy()
+                state_cache.append(state)
+            else:
+                sphere = {location for location in sphere_candidates if state.can_reach(location)}
 
-            for location in sphere:
-                state.collect(location.item, True, location)
+                for location in sphere:
+                    state.collect(location.item, True, location)
+                state_cache.append(state.copy())
 
             sphere_candidates -= sphere
             collection_spheres.append(sphere)
-            state_cache.append(state.copy())
 
             logging.debug('Calculated sphere %i, containing %i of %i progress items.', len(collection_spheres),
                           len(sphere),
@@ -1742,21 +1991,75 @@ class Spoiler:
         # in the second phase, we cull each sphere such that the game is still beatable,
         # reducing each range of influence to the bare minimum required inside it
         required_locations = {location for sphere in collection_spheres for location in sphere}
-        for num, sphere in reversed(tuple(enumerate(collection_spheres))):
-            to_delete: Set[Location] = set()
-            for location in sphere:
-                # we remove the location from required_locations to sweep from, and check if the game is still beatable
-                logging.debug('Checking if %s (Player %d) is required to beat the game.', location.item.name,
-                              location.item.player)
-                required_locations.remove(location)
-                if multiworld.can_beat_game(state_cache[num], required_locations):
-                    to_delete.add(location)
-                else:
-                    # still required, got to keep it around
+        if processes == 0:
+            # more workers than this mostly check locations that have to be checked again anyway
+            processes = min(os.cpu_count() or 1, 4)
+        pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        # daemonic processes, like WebHost generators, are not allowed to have children
+        if (processes > 1 and "fork" in multiprocessing.get_all_start_methods()
+                and not multiprocessing.current_process().daemon):
+            # workers are forked, so they share the multiworld and state cache as they are right now
+            worker_locations = list(required_locations)
+            location_indices = {location: index for index, location in enumerate(worker_locations)}
+            _playthrough_culling = (multiworld, state_cache, worker_locations)
+            pool = concurrent.futures.ProcessPoolExecutor(processes, multiprocessing.get_context("fork"))
+        else:
+            processes = 1
+
+        def sweep_to_goal_without(num: int, batch: List[Location]) -> List[Optional[Set[Location]]]:
+            """Sweep from sphere num without each location of the batch, see :func:`_sweep_to_goal`."""
+            if not pool:
+                results: List[Optional[Set[Location]]] = []
+                for location in batch:
+                    required_locations.remove(location)
+                    results.append(_sweep_to_goal(multiworld, state_cache[num], required_locations))
                     required_locations.add(location)
+                return results
+            removed = [index for location, index in location_indices.items() if location not in required_locations]
+            futures = [pool.submit(_sweep_to_goal_without, num, removed + [location_indices[location]])
+                       for location in batch]
+            return [None if swept is None else {worker_locations[index] for index in swept}
+                    for swept in (future.result() for future in futures)]
 
-            # cull entries in spheres for spoiler walkthrough at end
-            sphere -= to_delete
+        try:
+            for num, sphere in reversed(tuple(enumerate(collection_spheres))):
+                # Locations that weren't swept while beating the game are not required, without having to check them.
+                # The next few other locations are checked at once, each with all other required locations. Those
+                # results are exact, unless the game was beaten using a location that got culled in the meantime.
+                candidates = list(sphere)
+                swept_to_goal: Optional[Set[Location]] = None  # swept to beat the game with the required locations
+                index = 0
+                while index < len(candidates):
+                    batch = [location for location in candidates[index:]
+                             if swept_to_goal is None or location in swept_to_goal][:processes]
+                    results = dict(zip(batch, sweep_to_goal_without(num, batch)))
+                    culled: Set[Location] = set()
+                    for location in candidates[index:]:
+                        if swept_to_goal is not None and location not in swept_to_goal:
+                            pass
+                        elif location not in results:
+                            break
+                        else:
+                            logging.debug('Checking if %s (Player %d) is required to beat the game.',
+                                          location.item.name, location.item.player)
+                            swept = results[location]
+                            if swept is None:
+                                # still required, got to keep it around
+                                index += 1
+                                continue
+                            if not swept.isdisjoint(culled):
+                                break  # check again without the locations culled since
+                            swept_to_goal = swept
+                        required_locations.remove(location)
+                        culled.add(location)
+                        index += 1
+
+                    # cull entries in spheres for spoiler walkthrough at end
+                    sphere -= culled
+        finally:
+            if pool:
+                pool.shutdown()
+                _playthrough_culling = None
 
         # second phase, sphere 0
         removed_precollected: List[Item] = []
@@ -4,7 +4,8 @@ import logging
 import typing
 from collections import Counter, deque
 
-from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, PlandoItemBlock
+from BaseClasses import (CollectionState, Item, Location, LocationProgressType, MultiWorld, PlandoItemBlock,
+                         SphereFrontier)
 from Options import Accessibility
 
 from worlds.AutoWorld import call_all
@@ -33,6 +34,71 @@ def sweep_from_pool(base_state: CollectionState, itempool: typing.Sequence[Item]
     return new_state
 
 
+class _PlacementCandidates:
+    """
+    Candidate locations of a fill_restrictive call. Locations are bucketed per player for single player placement, and
+    reachability is remembered per exploration state for locations whose access rule only depends on that state, so an
+    unreachable location is not tested again for every item until the exploration state changes.
+    """
+    locations: typing.List[Location]
+    buckets: typing.Dict[int, typing.List[Location]]
+    state: typing.Optional[CollectionState]
+    reachable: typing.Dict[Location, bool]
+    """reachability of locations in `state`, only for locations with state dependent rules"""
+    state_dependent: typing.Dict[Location, bool]
+    frontier: SphereFrontier
+    """only used to find locations with state dependent rules"""
+
+    def __init__(self, base_state: CollectionState, locations: typing.List[Location]) -> None:
+        self.locations = locations
+        self.buckets = {}
+        self.state = None
+        self.reachable = {}
+        self.state_dependent = {}
+        self.frontier = SphereFrontier(base_state)
+
+    def get_bucket(self, player: int) -> typing.List[Location]:
+        bucket = self.buckets.get(player)
+        if bucket is None:
+            bucket = self.buckets[player] = [location for location in self.locations if location.player == player]
+        return bucket
+
+    def is_state_dependent(self, location: Location) -> bool:
+        dependent = self.state_dependent.get(location)
+        if dependent is None:
+            # the shortcut below is only exact if can_fill is the default and cannot bypass the access check
+            dependent = self.state_dependent[location] = (type(location).can_fill is Location.can_fill
+                                                          and location.always_allow is Location.always_allow
+                                                          and self.frontier.has_known_dependencies(location))
+        return dependent
+
+    def can_fill(self, location: Location, state: CollectionState, item: Item, check_access: bool) -> bool:
+        if check_access and self.is_state_dependent(location):
+            if state is not self.state:
+                self.state = state
+                self.reachable.clear()
+            reachable = self.reachable.get(location)
+            if reachable is None:
+                reachable = self.reachable[location] = location.can_reach(state)
+            return reachable and location.can_fill(state, item, False)
+        return location.can_fill(state, item, check_access)
+
+    def pop(self, state: CollectionState, item: Item, check_access: bool,
+            single_player_placement: bool) -> typing.Optional[Location]:
+        """Remove and return the first location that can be filled with the item, if any."""
+        candidates = self.get_bucket(item.player) if single_player_placement else self.locations
+        for i, location in enumerate(candidates):
+            if self.can_fill(location, state, item, check_access):
+                # popping by index is faster than removing by content, skipping a scan for the element
+                candidates.pop(i)
+                if candidates is not self.locations:
+                    self.locations.remove(location)
+                elif self.buckets:
+                    self.buckets[location.player].remove(location)
+                return location
+        return None
+
+
 def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locations: typing.List[Location],
                      item_pool: typing.List[Item], single_player_placement: bool = False, lock: bool = False,
                      swap: bool = True, on_place: typing.Optional[typing.Callable[[Location], None]] = None,
@@ -63,6 +129,14 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     total = min(len(item_pool), len(locations))
     placed = 0
 
+    # base_state with all items that still have to be placed collected, kept up to date as items get placed instead of
+    # collecting the whole pool again for each batch
+    pool_state = base_state.copy()
+    for item in item_pool:
+        pool_state.collect(item, True)
+
+    candidates = _PlacementCandidates(base_state, locations)
+
     while any(reachable_items.values()) and locations:
         if one_item_per_player:
             # grab one item per player
@@ -81,10 +155,10 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                 if pool_item is item:
                     del item_pool[-p]
                     break
+            pool_state.remove(item)
 
         maximum_exploration_state = sweep_from_pool(
-            base_state, item_pool + unplaced_items, multiworld.get_filled_locations(item.player)
-            if single_player_placement else None)
+            pool_state, (), multiworld.get_filled_locations(item.player) if single_player_placement else None)
 
         has_beaten_game = multiworld.has_beaten_game(maximum_exploration_state)
 
@@ -92,6 +166,8 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             # if we have run out of locations to fill,break out of this loop
             if not locations:
                 unplaced_items += items_to_place
+                for unplaced_item in items_to_place:
+                    pool_state.collect(unplaced_item, True)
                 break
             item_to_place = items_to_place.pop(0)
 
@@ -105,15 +181,9 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             else:
                 perform_access_check = True
 
-            for i, location in enumerate(locations):
-                if (not single_player_placement or location.player == item_to_place.player) \
-                        and location.can_fill(maximum_exploration_state, item_to_place, perform_access_check):
-                    # popping by index is faster than removing by content,
-                    spot_to_fill = locations.pop(i)
-                    # skipping a scan for the element
-                    break
-
-            else:
+            spot_to_fill = candidates.pop(maximum_exploration_state, item_to_place, perform_access_check,
+                                          single_player_placement)
+            if spot_to_fill is None:
                 # we filled all reachable spots.
                 if swap:
                     # Keep a cache of previous safe swap states that might be usable to sweep from to produce the next
@@ -180,6 +250,7 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                             reachable_items[placed_item.player].appendleft(
                                 placed_item)
                             item_pool.append(placed_item)
+                            pool_state.collect(placed_item, True)
 
                             # cleanup at the end to hopefully get better errors
                             cleanup_required = True
@@ -193,9 +264,11 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                     if spot_to_fill is None:
                         # Can't place this item, move on to the next
                         unplaced_items.append(item_to_place)
+                        pool_state.collect(item_to_place, True)
                         continue
                 else:
                     unplaced_items.append(item_to_place)
+                    pool_state.collect(item_to_place, True)
                     continue
             multiworld.push_item(spot_to_fill, item_to_place, False)
             spot_to_fill.locked = lock
@@ -749,6 +822,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
         logging.info(f"Balancing multiworld progression for {len(balanceable_players)} Players.")
         logging.debug(balanceable_players)
         state: CollectionState = CollectionState(multiworld)
+        frontier = SphereFrontier(state)
         checked_locations: typing.Set[Location] = set()
         unchecked_locations: typing.Set[Location] = set(multiworld.get_locations())
 
@@ -785,7 +859,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
             # Gather non-locked locations.
             # This ensures that only shuffled locations get counted for progression balancing,
             #   i.e. the items the players will be checking.
-            sphere_locations = get_sphere_locations(state, unchecked_locations)
+            sphere_locations = frontier.get_reachable(unchecked_locations)
             for location in sphere_locations:
                 unchecked_locations.remove(location)
                 if not location.locked:
@@ -816,6 +890,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                 }
                 if balancing_players:
                     balancing_state = state.copy()
+                    balancing_frontier = SphereFrontier(balancing_state)
                     balancing_unchecked_locations = unchecked_locations.copy()
                     balancing_reachables = reachable_locations_count.copy()
                     balancing_sphere = sphere_locations.copy()
@@ -833,7 +908,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                                         location.progress_type != LocationProgressType.PRIORITY):
                                     candidate_items[player].add(location)
                                     logging.debug(f"Candidate item: {location.name}, {location.item.name}")
-                        balancing_sphere = get_sphere_locations(balancing_state, balancing_unchecked_locations)
+                        balancing_sphere = balancing_frontier.get_reachable(balancing_unchecked_locations)
                         for location in balancing_sphere:
                             balancing_unchecked_locations.remove(location)
                             if not location.locked:
@@ -904,7 +979,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                     if old_moved_item_count < moved_item_count:
                         logging.debug(f"Moved {moved_item_count} items so far\n")
                         unlocked = {fresh for player in balancing_players for fresh in unlocked_locations[player]}
-                        for location in get_sphere_locations(state, unlocked):
+                        for location in frontier.get_reachable(unlocked):
                             unchecked_locations.remove(location)
                             if not location.locked:
                                 reachable_locations_count[location.player] += 1
@@ -140,6 +140,71 @@ def get_saving_second(seed_name: str, interval: int = 60) -> int:
     return int(hashlib.sha256(seed_name.encode()).hexdigest(), 16) % interval
 
 
+class SaveJournal:
+    """
+    Append-only file of changes made since the last full save (snapshot) of a Context.
+    Each record is a length prefixed zlib compressed pickle of Context.get_save_changes, so regular saves cost as much
+    as the activity since the previous save. Once the journal outgrows the snapshot it is compacted into a new snapshot.
+    """
+    path: str
+    journal_id: str
+    """ties records to the snapshot they continue, records of any older snapshot are ignored"""
+    size: int
+    snapshot_size: int
+    location_check_counts: typing.Dict[team_slot, int]
+    received_item_counts: typing.Dict[typing.Tuple[int, int, bool], int]
+    hints: typing.Dict[team_slot, typing.FrozenSet[Hint]]
+    status: typing.Dict[str, object]
+    """what snapshot and journal already contain, to find changes"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.journal_id = ""
+        self.size = 0
+        self.snapshot_size = 0
+        self.location_check_counts = {}
+        self.received_item_counts = {}
+        self.hints = {}
+        self.status = {}
+
+    @property
+    def needs_compaction(self) -> bool:
+        return not self.journal_id or self.size > self.snapshot_size
+
+    def read(self, journal_id: str) -> typing.List[dict]:
+        """Records continuing the snapshot with journal_id. A record cut off by a crash ends the journal."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        records: typing.List[dict] = []
+        offset = 0
+        while offset + 4 <= len(data):
+            end = offset + 4 + int.from_bytes(data[offset:offset + 4], "big")
+            if end > len(data):
+                break
+            record = restricted_loads(zlib.decompress(data[offset + 4:end]))
+            if record["journal_id"] == journal_id:
+                records.append(record)
+            offset = end
+        return records
+
+    def append(self, record: dict) -> None:
+        data = zlib.compress(pickle.dumps(record))
+        with open(self.path, "ab") as f:
+            f.write(len(data).to_bytes(4, "big") + data)
+        self.size += 4 + len(data)
+
+    def reset(self, journal_id: str, snapshot_size: int) -> None:
+        """Start an empty journal after a new snapshot was written."""
+        with open(self.path, "wb"):
+            pass
+        self.journal_id = journal_id
+        self.size = 0
+        self.snapshot_size = snapshot_size
+
+
 class Client(Endpoint):
     __slots__ = (
         "__weakref__",
@@ -266,6 +331,7 @@ class Context:
         self.shutdown_task = None
         self.data_filename = None
         self.save_filename = None
+        self.save_journal: typing.Optional[SaveJournal] = None
         self.saving = False
         self.player_names: typing.Dict[team_slot, str] = {}
         self.player_name_lookup: typing.Dict[str, team_slot] = {}
@@ -278,6 +344,11 @@ class Context:
         self.server = None
         self.countdown_timer = 0
         self.received_items = {}
+        self.new_item_receivers: typing.Set[team_slot] = set()  # receivers with items not yet sent to their clients
+        self.new_items_scheduled = False
+        # PrintJSON broadcasts not yet sent, in order, as runs of messages for the same team (None: all clients)
+        self.pending_texts: typing.List[typing.Tuple[typing.Optional[int], typing.List[dict]]] = []
+        self.texts_scheduled = False
         self.start_inventory = {}
         self.name_aliases: typing.Dict[team_slot, str] = {}
         self.location_checks = collections.defaultdict(set)
@@ -312,6 +383,7 @@ class Context:
         self.group_collected: typing.Dict[int, typing.Set[int]] = {}
         self.random = random.Random()
         self.stored_data = {}
+        self.stored_data_changes: typing.Set[str] = set()  # keys changed since the last save, for the save journal
         self.stored_data_notification_clients = collections.defaultdict(weakref.WeakSet)
         self.read_data = {}
         self.spheres = []
@@ -344,9 +416,9 @@ class Context:
             self.non_hintable_names[world_name] = world.hint_blacklist
 
         for game_package in self.gamespackage.values():
-            # remove groups from data sent to clients
-            del game_package["item_name_groups"]
-            del game_package["location_name_groups"]
+            # remove groups from data sent to clients, the package is shared by all contexts of this process
+            game_package.pop("item_name_groups", None)
+            game_package.pop("location_name_groups", None)
 
     def _init_game_data(self):
         for game_name, game_package in self.gamespackage.items():
@@ -421,6 +493,8 @@ class Context:
 
     def broadcast_all(self, msgs: typing.List[dict]):
         msg_is_text = all(msg["cmd"] == "PrintJSON" for msg in msgs)
+        if msg_is_text and self.pending_texts:
+            self._send_texts()  # keep the order of queued texts
         data = self.dumper(msgs)
         endpoints = (
             endpoint
@@ -430,11 +504,13 @@ class Context:
         async_start(self.broadcast_send_encoded_msgs(endpoints, data))
 
     def broadcast_text_all(self, text: str, additional_arguments: dict = {}):
-        self.logger.info("Notice (all): %s" % text)
-        self.broadcast_all([{**{"cmd": "PrintJSON", "data": [{ "text": text }]}, **additional_arguments}])
+        self.logger.info("Notice (all): %s", text)
+        self.queue_texts(None, [{**{"cmd": "PrintJSON", "data": [{ "text": text }]}, **additional_arguments}])
 
     def broadcast_team(self, team: int, msgs: typing.List[dict]):
         msg_is_text = all(msg["cmd"] == "PrintJSON" for msg in msgs)
+        if msg_is_text and self.pending_texts:
+            self._send_texts()  # keep the order of queued texts
         data = self.dumper(msgs)
         endpoints = (
             endpoint
@@ -443,6 +519,36 @@ class Context:
         )
         async_start(self.broadcast_send_encoded_msgs(endpoints, data))
 
+    def queue_texts(self, team: typing.Optional[int], msgs: typing.List[dict]):
+        """Queue PrintJSON messages for a team, or for all clients if team is None. Within an event loop, all messages
+        queued in one loop iteration are sent in order, with consecutive messages for the same team in one frame."""
+        if self.pending_texts and self.pending_texts[-1][0] == team:
+            self.pending_texts[-1][1].extend(msgs)
+        else:
+            self.pending_texts.append((team, list(msgs)))
+        if self.texts_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._send_texts()
+        else:
+            self.texts_scheduled = True
+            loop.call_soon(self._send_texts)
+
+    def _send_texts(self):
+        self.texts_scheduled = False
+        pending_texts = self.pending_texts
+        self.pending_texts = []
+        for team, msgs in pending_texts:
+            # split into chunks that are close to compression window of 64K but not too big on the wire
+            # (roughly 1300-2600 bytes after compression depending on repetitiveness)
+            for start in range(0, len(msgs), 140):
+                if team is None:
+                    self.broadcast_all(msgs[start:start + 140])
+                else:
+                    self.broadcast_team(team, msgs[start:start + 140])
+
     def broadcast(self, endpoints: typing.Iterable[Client], msgs: typing.List[dict]):
         msgs = self.dumper(msgs)
         async_start(self.broadcast_send_encoded_msgs(endpoints, msgs))
@@ -594,16 +700,33 @@ class Context:
 
     def _save(self, exit_save: bool = False) -> bool:
         try:
-            # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
-            encoded_save = pickle.dumps(self.get_save())
-            with open(self.save_filename, "wb") as f:
-                f.write(zlib.compress(encoded_save))
+            if exit_save or not self.save_journal or self.save_journal.needs_compaction:
+                self._save_snapshot()
+            else:
+                changes = self.get_save_changes()
+                if changes:
+                    self.save_journal.append(changes)
         except Exception as e:
             self.logger.exception(e)
             return False
         else:
             return True
 
+    def _save_snapshot(self):
+        if self.save_journal:
+            # everything changed up to now is part of the snapshot, changes after get_save_changes are in both
+            self.get_save_changes()
+        save_data = self.get_save()
+        journal_id = ""
+        if self.save_journal:
+            journal_id = save_data["journal_id"] = f"{random.getrandbits(64):016x}"
+        # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
+        encoded_save = zlib.compress(pickle.dumps(save_data))
+        with open(self.save_filename, "wb") as f:
+            f.write(encoded_save)
+        if self.save_journal:
+            self.save_journal.reset(journal_id, len(encoded_save))
+
     def init_save(self, enabled: bool = True):
         self.saving = enabled
         if self.saving:
@@ -612,16 +735,26 @@ class Context:
                 name, ext = os.path.splitext(self.data_filename)
                 self.save_filename = name + '.apsave' if ext.lower() in ('.archipelago', '.zip') \
                     else self.data_filename + '_' + 'apsave'
+            self.save_journal = SaveJournal(self.save_filename + "_journal")
             try:
-                with open(self.save_filename, 'rb') as f:
-                    save_data = restricted_loads(zlib.decompress(f.read()))
-                    self.set_save(save_data)
+                self._load_save()
             except FileNotFoundError:
                 self.logger.error('No save data found, starting a new game')
             except Exception as e:
                 self.logger.exception(e)
             self._start_async_saving()
 
+    def _load_save(self):
+        with open(self.save_filename, 'rb') as f:
+            save_data = restricted_loads(zlib.decompress(f.read()))
+            self.set_save(save_data)
+        if "journal_id" in save_data:
+            records = self.save_journal.read(save_data["journal_id"])
+            for record in records:
+                self.apply_save_changes(record)
+            if records:
+                self.logger.info(f"Applied {len(records)} save journal records")
+
     def _start_async_saving(self, atexit_save: bool = True):
         if not self.auto_saver_thread:
             def save_regularly():
@@ -659,28 +792,92 @@ class Context:
             "version": self.save_version,
             "connect_names": self.connect_names,
             "received_items": self.received_items,
-            "hints_used": dict(self.hints_used),
             "hints": dict(self.hints),
             "location_checks": dict(self.location_checks),
-            "name_aliases": self.name_aliases,
+            "stored_data": self.stored_data,
+            **self._get_save_status()
+        }
+
+        return d
+
+    def _get_save_status(self) -> dict:
+        """The small part of the save, saved in full by get_save and per changed key by get_save_changes."""
+        return {
+            "hints_used": dict(self.hints_used),
+            "name_aliases": dict(self.name_aliases),
             "client_game_state": dict(self.client_game_state),
             "client_activity_timers": tuple(
                 (key, value.timestamp()) for key, value in self.client_activity_timers.items()),
             "client_connection_timers": tuple(
                 (key, value.timestamp()) for key, value in self.client_connection_timers.items()),
             "random_state": self.random.getstate(),
-            "group_collected": dict(self.group_collected),
-            "stored_data": self.stored_data,
+            "group_collected": {group: set(players) for group, players in self.group_collected.items()},
             "game_options": {"hint_cost": self.hint_cost, "location_check_points": self.location_check_points,
                              "server_password": self.server_password, "password": self.password,
                              "release_mode": self.release_mode,
                              "remaining_mode": self.remaining_mode, "collect_mode": self.collect_mode,
                              "countdown_mode": self.countdown_mode,
                              "item_cheat": self.item_cheat, "compatibility": self.compatibility}
+        }
 
+    def get_save_changes(self) -> typing.Optional[dict]:
+        """Changes since the last save or snapshot for the save journal, None if nothing changed.
+        Unlike get_save, this does not recheck hints."""
+        journal = self.save_journal
+        location_checks: typing.Dict[team_slot, typing.Set[int]] = {}
+        for key, checks in list(self.location_checks.items()):
+            # checks are only ever added
+            if len(checks) != journal.location_check_counts.get(key, 0):
+                checks = set(checks)
+                location_checks[key] = checks
+                journal.location_check_counts[key] = len(checks)
+        received_items: typing.Dict[typing.Tuple[int, int, bool], typing.Tuple[int, typing.List[NetworkItem]]] = {}
+        for key, items in list(self.received_items.items()):
+            # items are only ever appended
+            start = journal.received_item_counts.get(key, 0)
+            if len(items) != start:
+                items = items[start:]
+                received_items[key] = start, items
+                journal.received_item_counts[key] = start + len(items)
+        hints: typing.Dict[team_slot, typing.Set[Hint]] = {}
+        for key, slot_hints in list(self.hints.items()):
+            if slot_hints != journal.hints.get(key, frozenset()):
+                slot_hints = frozenset(slot_hints)
+                hints[key] = set(slot_hints)
+                journal.hints[key] = slot_hints
+        stored_data: typing.Dict[str, object] = {}
+        for key in list(self.stored_data_changes):
+            # discard before reading, so a change made in the meantime is saved again next time
+            self.stored_data_changes.discard(key)
+            stored_data[key] = self.stored_data[key]
+        status: typing.Dict[str, object] = {}
+        for key, value in self._get_save_status().items():
+            # values are fresh copies, so they can be kept to compare against
+            if key not in journal.status or journal.status[key] != value:
+                status[key] = journal.status[key] = value
+        if not (location_checks or received_items or hints or stored_data or status):
+            return None
+        return {
+            "journal_id": journal.journal_id,
+            "location_checks": location_checks,
+            "received_items": received_items,
+            "hints": hints,
+            "stored_data": stored_data,
+            **status
         }
 
-        return d
+    def apply_save_changes(self, changes: dict):
+        self.location_checks.update(changes["location_checks"])
+        for key, (start, items) in changes["received_items"].items():
+            received_items = self.received_items.setdefault(key, [])
+            # a change can already be part of the snapshot or an earlier record
+            del received_items[start:]
+            received_items.extend(items)
+        self.hints.update(changes["hints"])
+        self.stored_data.update(changes["stored_data"])
+        if "name_aliases" in changes:
+            self.name_aliases.clear()
+        self._set_save_status(changes)
 
     def set_save(self, savedata: dict):
         if self.connect_names != savedata["connect_names"]:
@@ -688,19 +885,35 @@ class Context:
         if savedata["version"] > self.save_version:
             raise Exception("This savegame is newer than the server.")
         self.received_items = savedata["received_items"]
-        self.hints_used.update(savedata["hints_used"])
         self.hints.update(savedata["hints"])
-
-        self.name_aliases.update(savedata["name_aliases"])
-        self.client_game_state.update(savedata["client_game_state"])
-        self.client_connection_timers.update(
-            {tuple(key): datetime.datetime.fromtimestamp(value, datetime.timezone.utc) for key, value
-             in savedata["client_connection_timers"]})
-        self.client_activity_timers.update(
-            {tuple(key): datetime.datetime.fromtimestamp(value, datetime.timezone.utc) for key, value
-             in savedata["client_activity_timers"]})
         self.location_checks.update(savedata["location_checks"])
-        self.random.setstate(savedata["random_state"])
+        self._set_save_status(savedata)
+
+        if "stored_data" in savedata:
+            self.stored_data = savedata["stored_data"]
+        # count items and slots from lists for items_handling = remote
+        self.logger.info(
+            f'Loaded save file with {sum([len(v) for k, v in self.received_items.items() if k[2]])} received items '
+            f'for {sum(k[2] for k in self.received_items)} players')
+
+    def _set_save_status(self, savedata: dict):
+        # journal records only contain the keys that changed
+        if "hints_used" in savedata:
+            self.hints_used.update(savedata["hints_used"])
+        if "name_aliases" in savedata:
+            self.name_aliases.update(savedata["name_aliases"])
+        if "client_game_state" in savedata:
+            self.client_game_state.update(savedata["client_game_state"])
+        if "client_connection_timers" in savedata:
+            self.client_connection_timers.update(
+                {tuple(key): datetime.datetime.fromtimestamp(value, datetime.timezone.utc) for key, value
+                 in savedata["client_connection_timers"]})
+        if "client_activity_timers" in savedata:
+            self.client_activity_timers.update(
+                {tuple(key): datetime.datetime.fromtimestamp(value, datetime.timezone.utc) for key, value
+                 in savedata["client_activity_timers"]})
+        if "random_state" in savedata:
+            self.random.setstate(savedata["random_state"])
 
         if "game_options" in savedata:
             self.hint_cost = savedata["game_options"]["hint_cost"]
@@ -717,13 +930,6 @@ class Context:
         if "group_collected" in savedata:
             self.group_collected = savedata["group_collected"]
 
-        if "stored_data" in savedata:
-            self.stored_data = savedata["stored_data"]
-        # count items and slots from lists for items_handling = remote
-        self.logger.info(
-            f'Loaded save file with {sum([len(v) for k, v in self.received_items.items() if k[2]])} received items '
-            f'for {sum(k[2] for k in self.received_items)} players')
-
     # rest
 
     def get_hint_cost(self, slot):
@@ -1068,20 +1274,36 @@ def get_start_inventory(ctx: Context, player: int, remote_start_inventory: bool)
 
 
 def send_new_items(ctx: Context):
-    for team, clients in ctx.clients.items():
-        for slot, clients in clients.items():
-            for client in clients:
-                if client.no_items:
-                    continue
-                start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
-                items = get_received_items(ctx, team, slot, client.remote_items)
-                if len(start_inventory) + len(items) > client.send_index:
-                    first_new_item = max(0, client.send_index - len(start_inventory))
-                    async_start(ctx.send_msgs(client, [{
-                        "cmd": "ReceivedItems",
-                        "index": client.send_index,
-                        "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
-                    client.send_index = len(start_inventory) + len(items)
+    """Send new items to the clients of receivers marked in ctx.new_item_receivers.
+    Within an event loop, this is done once per loop iteration, so that rapid checks are combined."""
+    if ctx.new_items_scheduled:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _send_new_items(ctx)
+    else:
+        ctx.new_items_scheduled = True
+        loop.call_soon(_send_new_items, ctx)
+
+
+def _send_new_items(ctx: Context):
+    ctx.new_items_scheduled = False
+    receivers = ctx.new_item_receivers
+    ctx.new_item_receivers = set()
+    for team, slot in receivers:
+        for client in ctx.clients.get(team, {}).get(slot, ()):
+            if client.no_items:
+                continue
+            start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
+            items = get_received_items(ctx, team, slot, client.remote_items)
+            if len(start_inventory) + len(items) > client.send_index:
+                first_new_item = max(0, client.send_index - len(start_inventory))
+                async_start(ctx.send_msgs(client, [{
+                    "cmd": "ReceivedItems",
+                    "index": client.send_index,
+                    "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
+                client.send_index = len(start_inventory) + len(items)
 
 
 def update_checked_locations(ctx: Context, team: int, slot: int):
@@ -1129,6 +1351,7 @@ def send_items_to(ctx: Context, team: int, target_slot: int, *items: NetworkItem
             if item.player != target_slot:
                 get_received_items(ctx, team, target, False).append(item)
             get_received_items(ctx, team, target, True).append(item)
+        ctx.new_item_receivers.add((team, target))
 
 
 def register_location_checks(ctx: Context, team: int, slot: int, locations: typing.Iterable[int],
@@ -1148,20 +1371,19 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
             sortable.append((target_player, item_id, location, flags))
 
         info_texts: list[dict[str, typing.Any]] = []
+        log_sends = ctx.logger.isEnabledFor(logging.INFO)
         for target_player, item_id, location, flags in sorted(sortable):
             new_item = NetworkItem(item_id, location, slot, flags)
             send_items_to(ctx, team, target_player, new_item)
 
-            ctx.logger.info('(Team #%d) %s sent %s to %s (%s)' % (
-                team + 1, ctx.player_names[(team, slot)], ctx.item_names[ctx.slot_info[target_player].game][item_id],
-                ctx.player_names[(team, target_player)], ctx.location_names[ctx.slot_info[slot].game][location]))
-            if len(info_texts) >= 140:
-                # split into chunks that are close to compression window of 64K but not too big on the wire
-                # (roughly 1300-2600 bytes after compression depending on repetitiveness)
-                ctx.broadcast_team(team, info_texts)
-                info_texts.clear()
+            if log_sends:
+                ctx.logger.info('(Team #%d) %s sent %s to %s (%s)',
+                                team + 1, ctx.player_names[(team, slot)],
+                                ctx.item_names[ctx.slot_info[target_player].game][item_id],
+                                ctx.player_names[(team, target_player)],
+                                ctx.location_names[ctx.slot_info[slot].game][location])
             info_texts.append(json_format_send_event(new_item, target_player))
-        ctx.broadcast_team(team, info_texts)
+        ctx.queue_texts(team, info_texts)
         del info_texts
         del sortable
 
@@ -1675,6 +1897,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
                 new_item = NetworkItem(names[item_name], -1, self.client.slot)
                 get_received_items(self.ctx, self.client.team, self.client.slot, False).append(new_item)
                 get_received_items(self.ctx, self.client.team, self.client.slot, True).append(new_item)
+                self.ctx.new_item_receivers.add((self.client.team, self.client.slot))
                 self.ctx.broadcast_text_all(
                     'Cheat console: sending "' + item_name + '" to ' + self.ctx.get_aliased_name(self.client.team,
                                                                                                  self.client.slot),
@@ -2153,11 +2376,12 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             args["cmd"] = "Bounced"
             msg = ctx.dumper([args])
 
-            for bounceclient in ctx.endpoints:
+            # websockets.broadcast queues the message on all sockets without waiting for each one to send it
+            await ctx.broadcast_send_encoded_msgs((
+                bounceclient for bounceclient in ctx.endpoints
                 if client.team == bounceclient.team and (ctx.games[bounceclient.slot] in games or
                                                          set(bounceclient.tags) & tags or
-                                                         bounceclient.slot in slots):
-                    await ctx.send_encoded_msgs(bounceclient, msg)
+                                                         bounceclient.slot in slots)), msg)
 
         elif cmd == "Get":
             if "keys" not in args or type(args["keys"]) != list:
@@ -2187,6 +2411,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                 func = modify_functions[operation["operation"]]
                 value = func(value, operation["value"])
             ctx.stored_data[args["key"]] = args["value"] = value
+            ctx.stored_data_changes.add(args["key"])
             targets = set(ctx.stored_data_notification_clients[args["key"]])
             if args.get("want_reply", False):
                 targets.add(client)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections.abc import Mapping, Sequence
 import typing
 import enum
+import itertools
 import warnings
 from json import JSONEncoder, JSONDecoder
 
@@ -414,7 +415,51 @@ class Hint(typing.NamedTuple):
         return self.receiving_player == self.finding_player
 
 
+class _SlotLocations(typing.NamedTuple):
+    location_ids: typing.List[int]
+    """in store order"""
+    positions: typing.Dict[int, int]
+    """location id -> index in location_ids"""
+
+
+class _CheckedLocations:
+    """Checked flags of one slot's locations in store order, synced from the slot's set of checks that only grows."""
+    __slots__ = ("checked", "known", "flags", "missing_flags")
+
+    checked: typing.Set[int]
+    known: typing.Set[int]
+    """copy of checked as of the last sync"""
+    flags: bytearray
+    missing_flags: bytearray
+
+    def __init__(self, checked: typing.Set[int], slot_locations: _SlotLocations) -> None:
+        self.checked = checked
+        self.known = set()
+        self.flags = bytearray(len(slot_locations.location_ids))
+        self.missing_flags = bytearray(b"\x01" * len(slot_locations.location_ids))
+
+    def sync(self, slot_locations: _SlotLocations) -> None:
+        positions = slot_locations.positions
+        for location_id in self.checked - self.known:
+            position = positions.get(location_id)
+            if position is not None:
+                self.flags[position] = 1
+                self.missing_flags[position] = 0
+        self.known = self.checked.copy()
+
+
 class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tuple[int, int, int]]]):
+    # Reverse indexes by receiving player, built on first use. Like the compiled LocationStore, the content is not
+    # expected to change after construction.
+    _item_index: typing.Optional[typing.Dict[int, typing.Dict[int, typing.List[typing.Tuple[int, int, int, int]]]]]
+    """receiving player -> item id -> (position, finding player, location id, item flags) in store order"""
+    _source_index: typing.Optional[typing.Dict[int, typing.Dict[int, typing.Set[int]]]]
+    """receiving player -> finding player -> location ids"""
+    _slot_locations: typing.Dict[int, _SlotLocations]
+    _slot_remaining: typing.Dict[int, typing.List[typing.Tuple[int, int]]]
+    """slot -> (receiving player, item id) of its locations in store order"""
+    _checked_locations: typing.Dict[typing.Tuple[int, int], _CheckedLocations]
+
     def __init__(self, values: typing.MutableMapping[int, typing.Dict[int, typing.Tuple[int, int, int]]]):
         super().__init__(values)
 
@@ -427,21 +472,58 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
         if len(self.get(0, {})):
             raise ValueError("Invalid player id 0 for location")
 
-    def find_item(self, slots: typing.Set[int], seeked_item_id: int
-                  ) -> typing.Generator[typing.Tuple[int, int, int, int, int], None, None]:
+        self._item_index = None
+        self._source_index = None
+        self._slot_locations = {}
+        self._slot_remaining = {}
+        self._checked_locations = {}
+
+    def _build_indexes(self) -> None:
+        item_index: typing.Dict[int, typing.Dict[int, typing.List[typing.Tuple[int, int, int, int]]]] = {}
+        source_index: typing.Dict[int, typing.Dict[int, typing.Set[int]]] = {}
+        position = 0
         for finding_player, check_data in self.items():
             for location_id, (item_id, receiving_player, item_flags) in check_data.items():
-                if receiving_player in slots and item_id == seeked_item_id:
-                    yield finding_player, location_id, item_id, receiving_player, item_flags
+                item_index.setdefault(receiving_player, {}).setdefault(item_id, []).append(
+                    (position, finding_player, location_id, item_flags))
+                source_index.setdefault(receiving_player, {}).setdefault(finding_player, set()).add(location_id)
+                position += 1
+        self._item_index = item_index
+        self._source_index = source_index
+
+    def find_item(self, slots: typing.Set[int], seeked_item_id: int
+                  ) -> typing.Generator[typing.Tuple[int, int, int, int, int], None, None]:
+        if self._item_index is None:
+            self._build_indexes()
+        found = [(entry, receiving_player) for receiving_player in slots
+                 for entry in self._item_index.get(receiving_player, {}).get(seeked_item_id, ())]
+        if len(slots) > 1:
+            # keep the order of a full scan of the store
+            found.sort()
+        for (_, finding_player, location_id, item_flags), receiving_player in found:
+            yield finding_player, location_id, seeked_item_id, receiving_player, item_flags
 
     def get_for_player(self, slot: int) -> typing.Dict[int, typing.Set[int]]:
-        import collections
-        all_locations: typing.Dict[int, typing.Set[int]] = collections.defaultdict(set)
-        for source_slot, location_data in self.items():
-            for location_id, values in location_data.items():
-                if values[1] == slot:
-                    all_locations[source_slot].add(location_id)
-        return all_locations
+        if self._source_index is None:
+            self._build_indexes()
+        return {source_slot: locations.copy() for source_slot, locations in self._source_index.get(slot, {}).items()}
+
+    def _get_checked_locations(self, state: typing.Dict[typing.Tuple[int, int], typing.Set[int]], team: int, slot: int
+                               ) -> typing.Tuple[_SlotLocations, _CheckedLocations]:
+        checked = state[team, slot]
+        slot_locations = self._slot_locations.get(slot)
+        if slot_locations is None:
+            location_ids = list(self[slot])
+            slot_locations = self._slot_locations[slot] = _SlotLocations(
+                location_ids, dict(zip(location_ids, range(len(location_ids)))))
+        checked_locations = self._checked_locations.get((team, slot))
+        if checked_locations is None or checked_locations.checked is not checked \
+                or len(checked) < len(checked_locations.known):
+            # a different or shrunk set of checks can't be synced incrementally
+            checked_locations = self._checked_locations[team, slot] = _CheckedLocations(checked, slot_locations)
+        if len(checked) != len(checked_locations.known):
+            checked_locations.sync(slot_locations)
+        return slot_locations, checked_locations
 
     def get_checked(self, state: typing.Dict[typing.Tuple[int, int], typing.Set[int]], team: int, slot: int
                     ) -> typing.List[int]:
@@ -451,9 +533,8 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
             if slot not in self:
                 raise KeyError(slot)
             return []
-        return [location_id for
-                location_id in self[slot] if
-                location_id in checked]
+        slot_locations, checked_locations = self._get_checked_locations(state, team, slot)
+        return list(itertools.compress(slot_locations.location_ids, checked_locations.flags))
 
     def get_missing(self, state: typing.Dict[typing.Tuple[int, int], typing.Set[int]], team: int, slot: int
                     ) -> typing.List[int]:
@@ -461,17 +542,17 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
         if not checked:
             # This optimizes the case where everyone connects to a fresh game at the same time.
             return list(self[slot])
-        return [location_id for
-                location_id in self[slot] if
-                location_id not in checked]
+        slot_locations, checked_locations = self._get_checked_locations(state, team, slot)
+        return list(itertools.compress(slot_locations.location_ids, checked_locations.missing_flags))
 
     def get_remaining(self, state: typing.Dict[typing.Tuple[int, int], typing.Set[int]], team: int, slot: int
                       ) -> typing.List[typing.Tuple[int, int]]:
-        checked = state[team, slot]
-        player_locations = self[slot]
-        return sorted([(player_locations[location_id][1], player_locations[location_id][0]) for
-                        location_id in player_locations if
-                        location_id not in checked])
+        _, checked_locations = self._get_checked_locations(state, team, slot)
+        remaining = self._slot_remaining.get(slot)
+        if remaining is None:
+            remaining = self._slot_remaining[slot] = [(receiving_player, item_id) for item_id, receiving_player, _
+                                                      in self[slot].values()]
+        return sorted(itertools.compress(remaining, checked_locations.missing_flags))
 
 
 class MinimumVersions(typing.TypedDict):
@@ -687,6 +687,13 @@ class GeneratorOptions(Group):
         start_inventory -> Move remaining items to start_inventory, generate additional filler items to fill locations.
         """
 
+    class PlaythroughProcesses(int):
+        """
+        Number of worker processes used to cull the spoiler playthrough, 1 to cull in the generator process itself,
+        0 to pick based on CPU cores. Workers are forked from the generator, so only one process is used where fork
+        is not available.
+        """
+
     enemizer_path: EnemizerPath = EnemizerPath("EnemizerCLI/EnemizerCLI.Core")  # + ".exe" is implied on Windows
     player_files_path: PlayerFilesPath = PlayerFilesPath("Players")
     players: Players = Players(0)
@@ -696,6 +703,7 @@ class GeneratorOptions(Group):
     race: Race = Race(0)
     plando_options: PlandoOptions = PlandoOptions("bosses, connections, texts")
     panic_method: PanicMethod = PanicMethod("swap")
+    playthrough_processes: PlaythroughProcesses = PlaythroughProcesses(1)
     loglevel: str = "info"
     logtime: bool = False
 
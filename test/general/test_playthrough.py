@@ -0,0 +1,56 @@
+import unittest
+
+import BaseClasses
+from BaseClasses import Item, ItemClassification, MultiWorld
+from Fill import distribute_items_restrictive
+from test.general import generate_locations, generate_test_multiworld, setup_multiworld
+from worlds.AutoWorld import AutoWorldRegister
+
+
+class TestPlaythrough(unittest.TestCase):
+    def create_playthrough(self, multiworld: MultiWorld, processes: int) -> tuple[dict, dict]:
+        # culling reorders precollected items, so every run has to start from the same order
+        precollected_items = {player: items.copy() for player, items in multiworld.precollected_items.items()}
+        multiworld.spoiler.create_playthrough(create_paths=True, processes=processes)
+        for player, items in precollected_items.items():
+            multiworld.precollected_items[player][:] = items
+        return multiworld.spoiler.playthrough, multiworld.spoiler.paths
+
+    def test_processes(self) -> None:
+        """Test that culling with worker processes results in the same playthrough as culling in-process"""
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                multiworld = setup_multiworld([AutoWorldRegister.world_types["APQuest"]] * 3, seed=seed)
+                distribute_items_restrictive(multiworld)
+                playthrough = self.create_playthrough(multiworld, 1)
+                self.assertEqual(self.create_playthrough(multiworld, 2), playthrough)
+                self.assertEqual(self.create_playthrough(multiworld, 3), playthrough)
+
+    def test_skip_unswept(self) -> None:
+        """Test that locations the game was beaten without are culled without sweeping without each of them"""
+        multiworld = generate_test_multiworld()
+        player = 1
+        locations = generate_locations(6, player, multiworld.get_region("Menu", player))
+        for location, item_name in zip(locations, ("Key", "Goal", "Extra 1", "Extra 2", "Extra 3", "Extra 4")):
+            location.place_locked_item(Item(item_name, ItemClassification.progression, None, player))
+        locations[1].access_rule = lambda state: state.has("Key", player)
+        for location in locations[2:]:
+            location.access_rule = lambda state: state.has("Goal", player)
+        multiworld.completion_condition[player] = lambda state: state.has("Goal", player)
+
+        sweeps: list[tuple] = []
+        sweep_to_goal = BaseClasses._sweep_to_goal
+
+        def counting_sweep_to_goal(*args):
+            sweeps.append(args)
+            return sweep_to_goal(*args)
+
+        BaseClasses._sweep_to_goal = counting_sweep_to_goal
+        try:
+            playthrough = self.create_playthrough(multiworld, 1)
+        finally:
+            BaseClasses._sweep_to_goal = sweep_to_goal
+
+        self.assertEqual(playthrough[0], {"0": [], "1": {str(locations[0]): "Key"}, "2": {str(locations[1]): "Goal"}})
+        # the game is beaten before the extras, so only the first of them needs a sweep
+        self.assertEqual(len(sweeps), 3)
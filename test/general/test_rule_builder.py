@@ -4,7 +4,8 @@ from typing import Any, ClassVar, cast
 
 from typing_extensions import override
 
-from BaseClasses import CollectionState, Item, ItemClassification, Location, MultiWorld, Region
+from BaseClasses import CollectionState, Item, ItemClassification, Location, MultiWorld, Region, SphereFrontier
+from Fill import fill_restrictive
 from NetUtils import JSONMessagePart
 from Options import Choice, FreeText, Option, OptionSet, PerGameCommonOptions, Range, Toggle
 from rule_builder.cached_world import CachedRuleBuilderWorld
@@ -508,6 +509,74 @@ class TestCaching(CachedRuleBuilderTestCase):
         self.assertNotIn(id(entrance.access_rule), self.state.rule_builder_cache[1])
         self.assertTrue(entrance.can_reach(self.state))
 
+    def test_sphere_frontier(self) -> None:
+        locations = set(self.multiworld.get_locations())
+        frontier = SphereFrontier(self.state)
+        self.assertEqual(frontier.get_reachable(locations), {self.world.get_location("Location 1")})
+        self.assertTrue(frontier.has_known_dependencies(self.world.get_location("Location 4")))
+        self.assertFalse(frontier.has_known_dependencies(self.world.get_location("Location 5")))  # location dependency
+        self.assertFalse(frontier.has_known_dependencies(self.world.get_location("Location 6")))  # entrance dependency
+
+        for item_name in ("Item 1", "Item 5", "Item 2", "Item 3"):
+            self.state.collect(self.world.create_item(item_name))
+            if item_name == "Item 5":
+                # nothing Location 4 depends on changed, so it won't be tested again
+                frontier.update()
+                self.assertIn(self.world.get_location("Location 4"), frontier.waiting[self.player])
+            expected = {location for location in locations if location.can_reach(self.state)}
+            self.assertEqual(frontier.get_reachable(locations), expected)
+
+    def test_fill_restrictive_candidates(self) -> None:
+        locations = self.multiworld.get_unfilled_locations()
+        item_names = ("Item 1", "Item 2", "Item 3", "Item 7", "Item 8", "Item 9")
+        item_pool = [self.world.create_item(item_name) for item_name in item_names]
+        fill_restrictive(self.multiworld, self.state, locations, item_pool)
+        self.assertFalse(locations)
+        self.assertFalse(item_pool)
+
+        # remembered reachability must not have allowed placing any item out of logic
+        self.state.sweep_for_advancements()
+        for location in self.multiworld.get_locations():
+            self.assertTrue(location.can_reach(self.state), location)
+
+    def test_sphere_cache(self) -> None:
+        locations = self.multiworld.get_unfilled_locations()
+        item_names = ("Item 1", "Item 2", "Item 3", "Item 7", "Item 8", "Item 9")
+        fill_restrictive(self.multiworld, self.state, locations, [self.world.create_item(name) for name in item_names])
+
+        def get_uncached_spheres() -> list[set[Location]]:
+            sphere_cache, self.multiworld.sphere_cache = self.multiworld.sphere_cache, None
+            try:
+                return list(self.multiworld.get_spheres())
+            finally:
+                self.multiworld.sphere_cache = sphere_cache
+
+        uncached_spheres = get_uncached_spheres()
+        uncached_accessibility = self.multiworld.fulfills_accessibility()
+        self.multiworld.cache_spheres()
+        self.assertEqual(list(self.multiworld.get_spheres()), uncached_spheres)
+        self.assertEqual(self.multiworld.fulfills_accessibility(), uncached_accessibility)
+
+        # moved items are detected by identity, so swapping in another item has to invalidate the cache
+        location = self.world.get_location("Location 1")
+        item = location.item
+        location.item = self.world.create_item("Item 9")  # no rule depends on it
+        spheres = list(self.multiworld.get_spheres())
+        self.assertEqual(spheres, get_uncached_spheres())
+        self.assertEqual(spheres[0], {location})
+        self.assertFalse(spheres[1])
+
+        location.item = item
+        self.assertEqual(list(self.multiworld.get_spheres()), uncached_spheres)
+
+        # so do precollected items
+        for item_name in ("Item 1", "Item 2", "Item 3"):
+            self.multiworld.push_precollected(self.world.create_item(item_name))
+        spheres = list(self.multiworld.get_spheres())
+        self.assertEqual(spheres, get_uncached_spheres())
+        self.assertEqual(spheres, [set(self.multiworld.get_locations())])
+        self.assertTrue(self.multiworld.fulfills_accessibility())
+
 
 class TestCacheDisabled(RuleBuilderTestCase):
     multiworld: MultiWorld  # pyright: ignore[reportUninitializedInstanceVariable]
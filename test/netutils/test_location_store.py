@@ -248,6 +248,24 @@ class TestPurePythonLocationStore(Base.TestLocationStore):
         self.store = _LocationStore(sample_data)
         super().setUp()
 
+    def test_find_item_order(self) -> None:
+        # indexed lookups yield in the same order as a full scan of the store
+        self.assertEqual(list(self.store.find_item({3, 4, 5}, 99)),
+                         [(4, 9, 99, 3, 0), (3, 9, 99, 4, 0), (5, 9, 99, 5, 0)])
+        self.assertEqual(list(self.store.find_item({1, 2}, 12)), [(2, 22, 12, 1, 0)])
+
+    def test_checks_added(self) -> None:
+        # checked flags are synced from the growing set of checks of the same state
+        state: State = {(0, 1): {12}}
+        self.assertEqual(self.store.get_missing(state, 0, 1), [11, 13])
+        state[0, 1].add(13)
+        self.assertEqual(self.store.get_checked(state, 0, 1), [12, 13])
+        self.assertEqual(self.store.get_missing(state, 0, 1), [11])
+        self.assertEqual(self.store.get_remaining(state, 0, 1), [(2, 21)])
+        state[0, 1] = {11}
+        self.assertEqual(self.store.get_checked(state, 0, 1), [11])
+        self.assertEqual(self.store.get_remaining(state, 0, 1), [(1, 13), (2, 22)])
+
 
 class TestPurePythonLocationStoreConstructor(Base.TestLocationStoreConstructor):
     """Run base constructor tests for the pure python implementation."""
@@ -1,5 +1,10 @@
+import asyncio
+import os
+import tempfile
+import typing
 import unittest
-from MultiServer import Context, ServerCommandProcessor
+from MultiServer import Client, Context, SaveJournal, ServerCommandProcessor, send_items_to, send_new_items
+from NetUtils import NetworkItem, decode
 
 
 class TestResolvePlayerName(unittest.TestCase):
@@ -38,3 +43,158 @@ class TestResolvePlayerName(unittest.TestCase):
         assert p.resolve_player("ABC") == (1, 2, "abc"), "case insensitive resolves when 1 match"
         assert p.resolve_player("abcd") == (1, 3, "abCD"), "case insensitive resolves when 1 match"
         assert not p.resolve_player("aB"), "partial name shouldn't resolve to player"
+
+
+class TestSaveJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _create_context(self) -> Context:
+        ctx = Context("", 0, "", "", 0, 0, False)
+        ctx.save_filename = os.path.join(self.temp_dir.name, "test.apsave")
+        ctx.save_journal = SaveJournal(ctx.save_filename + "_journal")
+        return ctx
+
+    def test_journal(self) -> None:
+        ctx = self._create_context()
+        ctx.location_checks[0, 1] |= {1, 2}
+        self.assertTrue(ctx._save())  # first save is a snapshot
+        self.assertEqual(ctx.save_journal.size, 0)
+
+        item = NetworkItem(5, 1, 1, 0)
+        ctx.location_checks[0, 1] |= {3}
+        ctx.received_items.setdefault((0, 1, True), []).append(item)
+        ctx.stored_data["key"] = [1]
+        ctx.stored_data_changes.add("key")
+        ctx.name_aliases[0, 1] = "alias"
+        self.assertTrue(ctx._save())
+        self.assertGreater(ctx.save_journal.size, 0)
+
+        del ctx.name_aliases[0, 1]
+        ctx.received_items[0, 1, True].append(item)
+        self.assertTrue(ctx._save())
+        self.assertIsNone(ctx.get_save_changes())
+
+        # only changed parts of the status are journaled, and unchanged saves don't add a record at all
+        records = ctx.save_journal.read(ctx.save_journal.journal_id)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[-1]["name_aliases"], {})
+        self.assertNotIn("game_options", records[-1])
+        size = ctx.save_journal.size
+        self.assertTrue(ctx._save())
+        self.assertEqual(ctx.save_journal.size, size)
+
+        # status kept to compare against must not change along with the context
+        ctx.group_collected[3] = {1}
+        self.assertEqual(ctx.get_save_changes()["group_collected"], {3: {1}})
+        ctx.group_collected[3].add(2)
+        self.assertEqual(ctx.get_save_changes()["group_collected"], {3: {1, 2}})
+
+        loaded = self._create_context()
+        loaded._load_save()
+        self.assertEqual(loaded.location_checks[0, 1], {1, 2, 3})
+        self.assertEqual(loaded.received_items, {(0, 1, True): [item, item]})
+        self.assertEqual(loaded.stored_data, {"key": [1]})
+        self.assertEqual(loaded.name_aliases, {})
+
+    def test_compaction(self) -> None:
+        ctx = self._create_context()
+        self.assertTrue(ctx._save())
+        ctx.location_checks[0, 1] |= {1}
+        ctx.save_journal.snapshot_size = 0  # journal immediately outgrows the snapshot
+        self.assertTrue(ctx._save())
+        self.assertTrue(ctx._save())  # compacts
+        self.assertEqual(ctx.save_journal.size, 0)
+
+        # records of an older snapshot are ignored
+        ctx.save_journal.append({"journal_id": "stale", "location_checks": {(0, 1): {1, 2}}, "received_items": {},
+                                 "hints": {}, "stored_data": {}})
+        loaded = self._create_context()
+        loaded._load_save()
+        self.assertEqual(loaded.location_checks[0, 1], {1})
+
+
+class FakeSocket:
+    open = True
+
+    def __init__(self) -> None:
+        self.sent: typing.List[str] = []
+
+    async def send(self, msg: str) -> None:
+        self.sent.append(msg)
+
+
+class TestSendNewItems(unittest.IsolatedAsyncioTestCase):
+    async def test_only_receivers(self) -> None:
+        ctx = Context("", 0, "", "", 0, 0, False)
+        receiver, bystander = Client(FakeSocket(), ctx), Client(FakeSocket(), ctx)
+        ctx.clients = {0: {1: [receiver], 2: [bystander]}}
+
+        # two checks in the same event loop iteration are sent together
+        for location in (1, 2):
+            send_items_to(ctx, 0, 1, NetworkItem(5, location, 2, 0))
+            send_new_items(ctx)
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        self.assertEqual(len(receiver.socket.sent), 1)
+        self.assertEqual(len(decode(receiver.socket.sent[0])[0]["items"]), 2)
+        self.assertEqual(receiver.send_index, 2)
+        self.assertFalse(bystander.socket.sent)
+
+    def _capture_broadcasts(self, ctx: Context) -> typing.List[typing.Tuple[typing.List[Client], str]]:
+        broadcasts: typing.List[typing.Tuple[typing.List[Client], str]] = []
+
+        async def broadcast_send_encoded_msgs(endpoints: typing.Iterable[Client], msg: str) -> bool:
+            broadcasts.append((list(endpoints), msg))
+            return True
+
+        ctx.broadcast_send_encoded_msgs = broadcast_send_encoded_msgs  # FakeSocket doesn't support websockets.broadcast
+        return broadcasts
+
+    async def test_team_texts(self) -> None:
+        ctx = Context("", 0, "", "", 0, 0, False)
+        reader, no_text = Client(FakeSocket(), ctx), Client(FakeSocket(), ctx)
+        no_text.no_text = True
+        ctx.clients = {0: {1: [reader], 2: [no_text]}}
+        broadcasts = self._capture_broadcasts(ctx)
+
+        # texts queued in the same event loop iteration are sent in one frame
+        ctx.queue_texts(0, [{"cmd": "PrintJSON", "data": [{"text": "first"}]}])
+        ctx.queue_texts(0, [{"cmd": "PrintJSON", "data": [{"text": "second"}]}])
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        self.assertEqual(len(broadcasts), 1)
+        endpoints, msg = broadcasts[0]
+        self.assertEqual(endpoints, [reader])
+        self.assertEqual(len(decode(msg)), 2)
+
+    async def test_text_order(self) -> None:
+        ctx = Context("", 0, "", "", 0, 0, False)
+        reader = Client(FakeSocket(), ctx)
+        reader.auth = True
+        ctx.endpoints = [reader]
+        ctx.clients = {0: {1: [reader]}}
+        broadcasts = self._capture_broadcasts(ctx)
+
+        # item sends followed by a goal notice in the same frame arrive in that order
+        ctx.queue_texts(0, [{"cmd": "PrintJSON", "data": [{"text": "sent"}]}])
+        ctx.broadcast_text_all("goal")
+        ctx.queue_texts(0, [{"cmd": "PrintJSON", "data": [{"text": "sent later"}]}])
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        texts = [[msg["data"][0]["text"] for msg in decode(msg)] for _, msg in broadcasts]
+        self.assertEqual(texts, [["sent"], ["goal"], ["sent later"]])
+
+        # texts broadcast immediately are sent after the queued ones
+        broadcasts.clear()
+        ctx.queue_texts(0, [{"cmd": "PrintJSON", "data": [{"text": "queued"}]}])
+        ctx.broadcast_all([{"cmd": "PrintJSON", "data": [{"text": "immediate"}]}])
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        texts = [[msg["data"][0]["text"] for msg in decode(msg)] for _, msg in broadcasts]
+        self.assertEqual(texts, [["queued"], ["immediate"]])
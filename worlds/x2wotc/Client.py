@@ -1,10 +1,11 @@
 import asyncio
+import hashlib
 import os
 import re
 from typing import Any, TYPE_CHECKING
 import zipfile
 
-from CommonClient import gui_enabled, logger
+from CommonClient import NetworkItem, gui_enabled, logger
 from CommonClient import get_base_parser, handle_url_arg, server_loop
 from MultiServer import mark_raw
 import settings
@@ -20,12 +21,13 @@ if TYPE_CHECKING:
     from CommonClient import CommonContext, ClientCommandProcessor
 
 from .EnemyRando import EnemyRandoManager
+from .IniFile import IniFile, write_file_atomic
 from .Items import item_table, item_display_name_to_key
 from .Options import HintResearchProjects
-from .Proxy import run_proxy
+from .Proxy import check_batcher, run_proxy
 from .Version import CLIENT_NAME, GAME_NAME, client_version, client_minimum_mod_version, client_minimum_world_version
 
-from .mods import mods_data, mod_names
+from .mods import get_mods_data, mods_data_by_name, mod_names
 
 
 class X2WOTCCommandProcessor(ClientCommandProcessor):
@@ -114,7 +116,7 @@ class X2WOTCCommandProcessor(ClientCommandProcessor):
             for mod_name in self.ctx.active_mods:
                 self.output(f"- {mod_name}")
 
-            missing_mods = [mod_name for mod_name in self.ctx.active_mods if mod_name not in mod_names]
+            missing_mods = [mod_name for mod_name in self.ctx.active_mods if mod_name not in mods_data_by_name]
             if missing_mods:
                 self.output("These mods are active but not installed:")
                 for mod_name in missing_mods:
@@ -199,10 +201,17 @@ class X2WOTCContext(CommonContext):
 
     connected: DualEvent
     scouted: DualEvent
+    received_items_event: asyncio.Event
 
     proxy_port: int
     proxy_task: asyncio.Task | None
 
+    scout_cache_key: tuple[str | None, int | None] | None
+    scout_cache: dict[int, NetworkItem]
+    spoiler_entries: dict[int, dict[str, Any]]
+    spoiler_hash: tuple[str | None, bytes] | None
+    enemy_rando_spoiler: tuple[tuple[int, ...], str] | None
+
     slot_data: dict[str, Any]
     active_mods: list[str]
 
@@ -222,10 +231,18 @@ class X2WOTCContext(CommonContext):
 
         self.connected = self.DualEvent()
         self.scouted = self.DualEvent()
+        self.received_items_event = asyncio.Event()
 
         self.proxy_port = 24728
         self.proxy_task = None
 
+        # Scouted locations survive reconnects to the same seed and slot
+        self.scout_cache_key = None
+        self.scout_cache = {}
+        self.spoiler_entries = {}
+        self.spoiler_hash = None
+        self.enemy_rando_spoiler = None
+
         self.slot_data = {}
         self.active_mods = []
 
@@ -250,6 +267,7 @@ class X2WOTCContext(CommonContext):
             self.reset_config()
         self.connected.clear()
         self.scouted.clear()
+        self.notify_received_items()  # Release long-polling tick requests
         self.locations_scouted = set()
         self.slot_data = {}
         self.active_mods = []
@@ -269,16 +287,31 @@ class X2WOTCContext(CommonContext):
                 async_start(self.disconnect())
                 return
 
+            scout_cache_key = (self.seed_name, self.slot)
+            if scout_cache_key != self.scout_cache_key:
+                self.scout_cache_key = scout_cache_key
+                self.scout_cache = {}
+                self.spoiler_entries = {}
+                self.scouted.clear()
+                check_batcher.reset()
+
             self.connected.set()
             self.patch_config()
             self.update_config()
             self.patch_encounters()
             self.print_info("Client connected and config updated. Please restart your game if it is already running.")
 
+        elif cmd == "ReceivedItems":
+            self.notify_received_items()
+
         elif cmd == "LocationInfo":
-            scouted_locations = set(item.location for item in args["locations"])
-            if self.locations_scouted == scouted_locations:
-                self.scouted.set()
+            # Replies may be partial (e.g. hints), merge whatever arrives
+            for item in args["locations"]:
+                self.scout_cache[item.location] = item
+            if self.locations_scouted:
+                self.locations_scouted -= self.scout_cache.keys()
+                if not self.locations_scouted:
+                    self.scouted.set()
 
         # Help players who don't know to hint progressive items
         elif cmd == "PrintJSON":
@@ -301,6 +334,11 @@ class X2WOTCContext(CommonContext):
                     for progressive_item_name in progressive_item_names:
                         self.print_info(f"- {progressive_item_name}")
 
+    # Wake up everything currently waiting for new items
+    def notify_received_items(self):
+        self.received_items_event.set()
+        self.received_items_event.clear()
+
     def validate_world_version(self) -> bool:
         world_version = self.slot_data["world_version"]
         world_minimum_client_version = self.slot_data["minimum_client_version"]
@@ -433,42 +471,33 @@ class X2WOTCContext(CommonContext):
             self.update_config({"ProxyPort": str(self.proxy_port)})
 
     def patch_config(self):
-        CLASS_PREFIX = "[WOTCArchipelago."
-        CLASS_SUFFIX = "]"
-        AUTO_CODE_BEGIN = "; MOD ENTRIES BEGIN\n"
-        AUTO_CODE_END = "; MOD ENTRIES END\n"
+        CLASS_PREFIX = "WOTCArchipelago."
+        AUTO_CODE_BEGIN = "; MOD ENTRIES BEGIN"
+        AUTO_CODE_END = "; MOD ENTRIES END"
 
-        with open(self.config_file, "r") as file:
-            config = file.read()
+        config = IniFile(self.config_file)
 
-        insert_dict = {
-            line[len(CLASS_PREFIX):-len(CLASS_SUFFIX)]: ""
-            for line in config.splitlines()
-            if line.startswith(CLASS_PREFIX) and line.endswith(CLASS_SUFFIX)
+        insert_dict: dict[str, list[str]] = {
+            section[len(CLASS_PREFIX):]: []
+            for section in config.sections.keys()
+            if section.startswith(CLASS_PREFIX)
         }
 
-        for mod_data in mods_data:
-            if mod_data.name in self.active_mods:
-                for key, value in mod_data.config.items():
-                    if key not in insert_dict:
-                        logger.warning(
-                            f"X2WOTCClient: Class {key} for mod {mod_data.name} "
-                            "not mentioned in config file, skipping"
-                        )
-                        continue
-                    insert_dict[key] += f"{value}\n"
+        active_mods_data, _ = get_mods_data(frozenset(self.active_mods))
+        for mod_data in active_mods_data:
+            for key, value in mod_data.config.items():
+                if key not in insert_dict:
+                    logger.warning(
+                        f"X2WOTCClient: Class {key} for mod {mod_data.name} "
+                        "not mentioned in config file, skipping"
+                    )
+                    continue
+                insert_dict[key] += value.split("\n")
 
         for key, value in insert_dict.items():
-            class_index = config.find(CLASS_PREFIX + key + CLASS_SUFFIX)
+            config.replace_block(CLASS_PREFIX + key, AUTO_CODE_BEGIN, AUTO_CODE_END, value)
 
-            auto_code_begin_index = config.find(AUTO_CODE_BEGIN, class_index) + len(AUTO_CODE_BEGIN)
-            auto_code_end_index = config.find(AUTO_CODE_END, class_index)
-
-            if auto_code_end_index != -1:
-                config = config[:auto_code_begin_index] + value + config[auto_code_end_index:]
-
-        with open(self.config_file, "w") as file:
-            file.write(config)
+        config.save()
 
     def update_config(self, config_values: dict[str, str] = {}):
         if not config_values:
@@ -505,14 +534,9 @@ class X2WOTCContext(CommonContext):
                 "DEF_NO_STARTING_TRAPS_TACTICAL": str(self.slot_data.get("disable_turn_one_traps", False)),
             }
 
-        with open(self.config_file, "r") as file:
-            config = file.read()
-
-        for key, value in config_values.items():
-            config = re.sub(f"\n{re.escape(key)}={r"(\S*)"}", f"\n{key}={value}", config)
-
-        with open(self.config_file, "w") as file:
-            file.write(config)
+        config = IniFile(self.config_file)
+        config.set_values(config_values)
+        config.save()
 
     def reset_config(self):
         self.update_config({
@@ -524,66 +548,77 @@ class X2WOTCContext(CommonContext):
 
     def patch_encounters(self):
         for file_path in [self.encounters_file, self.encounter_lists_file]:
-            with open(file_path, "r") as file:
-                old_lines = file.readlines()
+            encounters = IniFile(file_path)
 
-            new_text = ""
-            for old_line in old_lines:
+            new_lines = []
+            for old_line in encounters.lines:
                 if not old_line.startswith("+"):
-                    new_text += old_line
+                    new_lines.append(old_line)
 
                 if old_line.startswith("-"):
                     new_line = old_line.replace("-", "+", 1)
-                    for placement_index, placed_index in enumerate(self.enemy_rando_manager.enemy_shuffle):
-                        placement_enemy = self.enemy_rando_manager.enemy_names[placement_index]
-                        new_line = re.sub(f'"{re.escape(placement_enemy)}"', f"[enemy_{placed_index}]", new_line, flags=re.IGNORECASE)
-                    for placed_index, placed_enemy in enumerate(self.enemy_rando_manager.enemy_names):
-                        new_line = new_line.replace(f"[enemy_{placed_index}]", f'"{placed_enemy}"')
-                    new_text += new_line
+                    new_lines.append(self.enemy_rando_manager.replace_placement_enemies(new_line))
 
-            with open(file_path, "w") as file:
-                file.write(new_text)
+            encounters.replace_lines(new_lines)
+            encounters.save()
 
     def fill_spoiler(self, entries: list[dict[str, str | int]]):
-        spoiler = "[WOTCArchipelago.WOTCArchipelago_Spoiler]\n"
-
-        # Multiworld item placements
-        for entry in entries:
-            spoiler += (
-                "+Spoiler=("
-                f'Location="{entry["location"]}", '
-                f'Item="{"".join(entry["item"].splitlines())}", '
-                f'Player="{"".join(entry["player"].splitlines())}", '
-                f'Game="{"".join(entry["game"].splitlines())}", '
-                f"bProgression={bool(entry["flags"] & 0b001)}, "
-                f"bUseful={bool(entry["flags"] & 0b010)}, "
-                f"bTrap={bool(entry["flags"] & 0b100)})\n"
+        spoiler = "".join([
+            "[WOTCArchipelago.WOTCArchipelago_Spoiler]\n",
+            *[self.render_spoiler_entry(entry) for entry in entries],  # Multiworld item placements
+            self.get_enemy_rando_spoiler(),
+        ])
+
+        # Only rewrite the file if its content changed
+        spoiler_hash = (self.spoiler_file, hashlib.sha256(spoiler.encode()).digest())
+        if spoiler_hash == self.spoiler_hash:
+            return
+        write_file_atomic(self.spoiler_file, spoiler)
+        self.spoiler_hash = spoiler_hash
+
+    @staticmethod
+    def render_spoiler_entry(entry: dict[str, str | int]) -> str:
+        return (
+            "+Spoiler=("
+            f'Location="{entry["location"]}", '
+            f'Item="{"".join(entry["item"].splitlines())}", '
+            f'Player="{"".join(entry["player"].splitlines())}", '
+            f'Game="{"".join(entry["game"].splitlines())}", '
+            f"bProgression={bool(entry["flags"] & 0b001)}, "
+            f"bUseful={bool(entry["flags"] & 0b010)}, "
+            f"bTrap={bool(entry["flags"] & 0b100)})\n"
+        )
+
+    # The enemy rando section only depends on the enemy shuffle, so it is rendered once per shuffle
+    def get_enemy_rando_spoiler(self) -> str:
+        if not self.slot_data["enemy_rando"]:
+            return ""
+
+        cache_key = tuple(self.enemy_rando_manager.enemy_shuffle)
+        if self.enemy_rando_spoiler is not None and self.enemy_rando_spoiler[0] == cache_key:
+            return self.enemy_rando_spoiler[1]
+
+        lines = []
+        for placed_enemy, placed_enemy_data in self.enemy_rando_manager.get_placed_enemies_data().items():
+            lines.append(
+                "+EnemyRando=("
+                f'DefaultTemplateName="{placed_enemy_data.placement_enemy}", '
+                f'OverrideTemplateName="{placed_enemy}")\n'
             )
 
-        # Enemy rando
-        if self.slot_data["enemy_rando"]:
-            for placed_enemy in self.enemy_rando_manager.enemy_names:
-                placement_enemy = self.enemy_rando_manager.get_placement_enemy(placed_enemy)
-                spoiler += (
-                    "+EnemyRando=("
-                    f'DefaultTemplateName="{placement_enemy}", '
-                    f'OverrideTemplateName="{placed_enemy}")\n'
+            # Stat changes
+            for stat_change in placed_enemy_data.stat_changes:
+                lines.append(
+                    f"+CharStatChanges=("
+                    f'TemplateName="{placed_enemy}", '
+                    f'StatType="{stat_change.type}", '
+                    f"Delta={stat_change.delta}, "
+                    f"Minimum={stat_change.min}, "
+                    f"Maximum={stat_change.max})\n"
                 )
 
-                # Stat changes
-                stat_changes = self.enemy_rando_manager.get_stat_changes(placed_enemy)
-                for stat_change in stat_changes:
-                    spoiler += (
-                        f"+CharStatChanges=("
-                        f'TemplateName="{placed_enemy}", '
-                        f'StatType="{stat_change.type}", '
-                        f"Delta={stat_change.delta}, "
-                        f"Minimum={stat_change.min}, "
-                        f"Maximum={stat_change.max})\n"
-                    )
-
-        with open(self.spoiler_file, "w") as file:
-            file.write(spoiler)
+        self.enemy_rando_spoiler = (cache_key, "".join(lines))
+        return self.enemy_rando_spoiler[1]
 
 
 def launch(*args):
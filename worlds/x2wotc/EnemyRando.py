@@ -1,4 +1,5 @@
 from random import Random
+import re
 from typing import NamedTuple
 
 from Options import OptionError
@@ -20,6 +21,22 @@ class EnemyData(NamedTuple):
     stat_changes: dict[int, list[StatChange]] = {}
 
 
+class PlacedEnemyData(NamedTuple):
+    placement_enemy: str
+    difficulty: float
+    bucket: int
+    stat_changes: list[StatChange]
+
+
+class ResolvedEnemyShuffle(NamedTuple):
+    placement_indices: list[int]
+    difficulties: dict[str, float]
+    buckets: dict[str, int]
+    index_difficulties: list[float]
+    quoted_placed_enemies: dict[str, str]
+    enemy_table: dict[str, EnemyData]  # Keeps the enemy table alive, so its id in the cache key isn't reused
+
+
 # Enemies are divided into buckets 0-5 by approximate defensive and offensive capabilities.
 # Some examples of enemies, stat ranges (on commander difficulty) and notes for each bucket:
 #   0: AdvTrooperM1
@@ -942,19 +959,58 @@ enemy_table: dict[str, EnemyData] = {
 }
 
 enemy_names: list[str] = sorted(enemy_table.keys())
+enemy_name_to_index: dict[str, int] = {enemy_name: index for index, enemy_name in enumerate(enemy_names)}
+
+# Indices of all direct and indirect base enemies of each enemy (a placement enemy may not be replaced by any of these)
+base_enemy_indices: list[frozenset[int]] = []
+for enemy_name in enemy_names:
+    visited: set[str] = set()
+    stack = enemy_table[enemy_name].base_enemies.copy()
+    while stack:
+        current = stack.pop()
+        if current not in visited:
+            visited.add(current)
+            stack.extend(enemy_table[current].base_enemies)
+    base_enemy_indices.append(frozenset(enemy_name_to_index[base_enemy] for base_enemy in visited))
+
+# Matches any quoted enemy name (case-insensitive), used to rewrite encounter config lines in a single pass
+quoted_enemy_name_pattern = re.compile(
+    '"(' + "|".join(re.escape(enemy_name) for enemy_name in enemy_names) + ')"',
+    flags=re.IGNORECASE
+)
+
+
+# Resolved enemy shuffles keyed on the enemy table's identity and the enemy shuffle,
+# shared between all players with the same enemy shuffle (e.g. all players without enemy rando)
+resolved_shuffle_cache: dict[tuple[int, tuple[int, ...]], ResolvedEnemyShuffle] = {}
 
 
 class EnemyRandoManager:
     enemy_table = enemy_table
     enemy_names = enemy_names
+    enemy_name_to_index = enemy_name_to_index
+    base_enemy_indices = base_enemy_indices
+    quoted_enemy_name_pattern = quoted_enemy_name_pattern
+
+    # Shared between all players, since enemy plandos are often copied from the same template
+    enemy_filter_cache: dict[tuple[str, ...], frozenset[int]] = {}
 
     def __init__(self):
         self.enemy_shuffle: list[int] = list(range(len(self.enemy_names)))
         self.is_shuffled: bool = False
 
+        # Resolved from the enemy shuffle whenever it is set, indexed by placed enemy
+        self.placement_indices: list[int] = []
+        self.difficulties: dict[str, float] = {}
+        self.buckets: dict[str, int] = {}
+        self.index_difficulties: list[float] = []  # Same as difficulties, but indexed by placed enemy index
+        self.quoted_placed_enemies: dict[str, str] = {}  # Lowercase placement enemy -> quoted placed enemy
+        self.shuffle_key: tuple[int, tuple[int, ...]] = (id(self.enemy_table), tuple(self.enemy_shuffle))
+
         # If this triggers, something is wrong with the above data table
         if self.has_base_enemies_loop():
             raise Exception("EnemyRando: base_enemies loop detected in unshuffled enemy table")
+        self.resolve_enemy_shuffle()
 
     def shuffle_enemies(self, enemy_plando: EnemyPlando, random: Random):
         if self.is_shuffled:
@@ -962,30 +1018,82 @@ class EnemyRandoManager:
         self.is_shuffled = True
 
         shuffle_groups = self.interpret_enemy_plando(enemy_plando)
-        for _ in range(100):
-
-            # Shuffle enemies within each group
-            for group in shuffle_groups:
-                placement_indices = list(group[0])
-                placed_indices = list(group[1])
-                random.shuffle(placed_indices)
-                for placement_index, placed_index in zip(placement_indices, placed_indices):
-                    self.enemy_shuffle[placement_index] = placed_index
-
-            # As long as the shuffle is invalid, simply shuffle again
-            if not self.has_base_enemies_loop():
-                break
-
-        # Failure is virtually always due to impossible enemy plando
-        else:
-            raise OptionError(
-                "X2WOTC: Unable to create enemy shuffle without base_enemies loop. "
-                "Check your Enemy Plando for impossible constraints."
-            )
+
+        # Shuffle enemies within each group, then move as few enemies as needed to avoid base_enemies loops
+        for group in shuffle_groups:
+            placement_indices = list(group[0])
+            placed_indices = list(group[1])
+            random.shuffle(placed_indices)
+            placed_indices = self.repair_placements(placement_indices, placed_indices)
+            for placement_index, placed_index in zip(placement_indices, placed_indices):
+                self.enemy_shuffle[placement_index] = placed_index
+
+        self.resolve_enemy_shuffle()
 
     def set_enemy_shuffle(self, enemy_shuffle: list[int]):
         self.enemy_shuffle = enemy_shuffle
         self.is_shuffled = True
+        self.resolve_enemy_shuffle()
+
+    # Precompute placement enemies, difficulties and buckets of all placed enemies for the current enemy shuffle
+    def resolve_enemy_shuffle(self):
+        self.shuffle_key = (id(self.enemy_table), tuple(self.enemy_shuffle))
+        if self.shuffle_key not in resolved_shuffle_cache:
+            self.placement_indices = [0] * len(self.enemy_names)
+            for placement_index, placed_index in enumerate(self.enemy_shuffle):
+                self.placement_indices[placed_index] = placement_index
+
+            self.difficulties = {}
+            self.buckets = {}
+            for placed_enemy in self.enemy_names:
+                self.resolve_placed_enemy(placed_enemy, set())
+
+            # If placement enemies only differ in case, the first one wins
+            quoted_placed_enemies = {}
+            for placement_index, placed_index in enumerate(self.enemy_shuffle):
+                quoted_placed_enemies.setdefault(
+                    self.enemy_names[placement_index].lower(),
+                    f'"{self.enemy_names[placed_index]}"'
+                )
+
+            resolved_shuffle_cache[self.shuffle_key] = ResolvedEnemyShuffle(
+                placement_indices=self.placement_indices,
+                difficulties=self.difficulties,
+                buckets=self.buckets,
+                index_difficulties=[self.difficulties[placed_enemy] for placed_enemy in self.enemy_names],
+                quoted_placed_enemies=quoted_placed_enemies,
+                enemy_table=self.enemy_table,
+            )
+
+        resolved_shuffle = resolved_shuffle_cache[self.shuffle_key]
+        self.placement_indices = resolved_shuffle.placement_indices
+        self.difficulties = resolved_shuffle.difficulties
+        self.buckets = resolved_shuffle.buckets
+        self.index_difficulties = resolved_shuffle.index_difficulties
+        self.quoted_placed_enemies = resolved_shuffle.quoted_placed_enemies
+
+    # Resolve the base enemies of a placed enemy's placement first, so every enemy is only resolved once
+    def resolve_placed_enemy(self, placed_enemy: str, resolving: set[str]):
+        if placed_enemy in self.difficulties:
+            return
+        if placed_enemy in resolving:
+            raise Exception("EnemyRando: base_enemies loop detected in enemy shuffle")
+        resolving.add(placed_enemy)
+
+        placement_enemy = self.get_placement_enemy(placed_enemy)
+        base_enemies = self.enemy_table[placement_enemy].base_enemies
+        for base_enemy in base_enemies:
+            self.resolve_placed_enemy(base_enemy, resolving)
+
+        placement_base_difficulty = min([self.difficulties[enemy] for enemy in base_enemies], default=0.0)
+        placement_relative_difficulty = self.enemy_table[placement_enemy].difficulty
+        self.difficulties[placed_enemy] = placement_base_difficulty + placement_relative_difficulty
+
+        placement_base_bucket = min([self.buckets[enemy] for enemy in base_enemies], default=0)
+        placement_relative_bucket = self.get_relative_bucket(placement_enemy)
+        self.buckets[placed_enemy] = max(placement_base_bucket + placement_relative_bucket, 0)
+
+        resolving.remove(placed_enemy)
 
     # Translate EnemyPlando into shuffle groups of placement and placed enemy indices
     def interpret_enemy_plando(self, enemy_plando: EnemyPlando) -> set[tuple[frozenset[int], frozenset[int]]]:
@@ -994,31 +1102,16 @@ class EnemyRandoManager:
         used_placed_indices: set[int] = set()
 
         # Evaluate fixed placements
-        filter: str
-        for filter in enemy_plando["fixed"]:
-            for enemy_index, enemy_name in enumerate(self.enemy_names):
-                if self.evaluate_enemy_filter(filter, enemy_name):
-                    shuffle_groups.add((frozenset({enemy_index}), frozenset({enemy_index})))
-                    used_placement_indices.add(enemy_index)
-                    used_placed_indices.add(enemy_index)
+        for enemy_index in sorted(self.match_enemy_filters(enemy_plando["fixed"])):
+            shuffle_groups.add((frozenset({enemy_index}), frozenset({enemy_index})))
+            used_placement_indices.add(enemy_index)
+            used_placed_indices.add(enemy_index)
 
         # Evaluate forced groups
         group: list[list[str]]  # len(group) == 2
         for group_index, group in enumerate(enemy_plando["forced"]):
-
-            # Collect placement enemies
-            placement_indices: set[int] = set()
-            for filter in group[0]:
-                for enemy_index, enemy_name in enumerate(self.enemy_names):
-                    if self.evaluate_enemy_filter(filter, enemy_name):
-                        placement_indices.add(enemy_index)
-
-            # Collect placed enemies
-            placed_indices: set[int] = set()
-            for filter in group[1]:
-                for enemy_index, enemy_name in enumerate(self.enemy_names):
-                    if self.evaluate_enemy_filter(filter, enemy_name):
-                        placed_indices.add(enemy_index)
+            placement_indices = self.match_enemy_filters(group[0])
+            placed_indices = self.match_enemy_filters(group[1])
 
             # Validate group
             if len(placement_indices) != len(placed_indices):
@@ -1032,7 +1125,7 @@ class EnemyRandoManager:
                     "Make sure no enemy matches multiple placement or placed filters."
                 )
 
-            shuffle_groups.add((frozenset(placement_indices), frozenset(placed_indices)))
+            shuffle_groups.add((placement_indices, placed_indices))
             used_placement_indices.update(placement_indices)
             used_placed_indices.update(placed_indices)
 
@@ -1044,46 +1137,104 @@ class EnemyRandoManager:
 
         return shuffle_groups
 
+    # Keep all valid placements of a shuffled group and re-place the rest along augmenting paths
+    def repair_placements(self, placement_indices: list[int], placed_indices: list[int]) -> list[int]:
+        placed_by_placement: dict[int, int] = {}
+        placement_by_placed: dict[int, int] = {}
+        for placement_index, placed_index in zip(placement_indices, placed_indices):
+            if placed_index not in self.base_enemy_indices[placement_index]:
+                placed_by_placement[placement_index] = placed_index
+                placement_by_placed[placed_index] = placement_index
+
+        for placement_index in placement_indices:
+            if placement_index in placed_by_placement:
+                continue
+
+            # If no augmenting path exists now, none will later, so the group has no valid shuffle at all
+            if not self.place_along_augmenting_path(
+                placement_index, placed_indices, placed_by_placement, placement_by_placed, set()
+            ):
+                raise OptionError(
+                    "X2WOTC: Unable to create enemy shuffle without base_enemies loop: "
+                    f"no valid placement for {self.enemy_names[placement_index]}. "
+                    "Check your Enemy Plando for impossible constraints."
+                )
+
+        return [placed_by_placement[placement_index] for placement_index in placement_indices]
+
+    def place_along_augmenting_path(
+            self,
+            placement_index: int,
+            placed_indices: list[int],
+            placed_by_placement: dict[int, int],
+            placement_by_placed: dict[int, int],
+            visited: set[int]
+        ) -> bool:
+        for placed_index in placed_indices:
+            if placed_index in visited or placed_index in self.base_enemy_indices[placement_index]:
+                continue
+            visited.add(placed_index)
+
+            # Take the placed enemy if it is free, or if its current placement can be moved elsewhere
+            other_placement_index = placement_by_placed.get(placed_index)
+            if other_placement_index is None or self.place_along_augmenting_path(
+                other_placement_index, placed_indices, placed_by_placement, placement_by_placed, visited
+            ):
+                placed_by_placement[placement_index] = placed_index
+                placement_by_placed[placed_index] = placement_index
+                return True
+
+        return False
+
     # Check for exact match or fall back to substring match
     def evaluate_enemy_filter(self, filter: str, enemy_name: str) -> bool:
-        if filter in self.enemy_names:
+        if filter in self.enemy_name_to_index:
             return filter == enemy_name
         return filter in enemy_name
 
+    # Collect indices of enemies matching any filter, with all substring filters compiled into a single pattern
+    def match_enemy_filters(self, filters: list[str]) -> frozenset[int]:
+        cache_key = tuple(filters)
+        if cache_key in self.enemy_filter_cache:
+            return self.enemy_filter_cache[cache_key]
+
+        enemy_indices = {self.enemy_name_to_index[filter] for filter in filters if filter in self.enemy_name_to_index}
+        substring_filters = [filter for filter in filters if filter not in self.enemy_name_to_index]
+        if substring_filters:
+            substring_pattern = re.compile("|".join(re.escape(filter) for filter in substring_filters))
+            enemy_indices.update(
+                enemy_index
+                for enemy_index, enemy_name in enumerate(self.enemy_names)
+                if substring_pattern.search(enemy_name)
+            )
+
+        self.enemy_filter_cache[cache_key] = frozenset(enemy_indices)
+        return self.enemy_filter_cache[cache_key]
+
     # Check for loops in base enemy dependencies due to the shuffle
     def has_base_enemies_loop(self) -> bool:
-        for index, name in enumerate(self.enemy_names):
-
-            # DFS to accumulate dependencies
-            visited = set()
-            stack = self.enemy_table[name].base_enemies.copy()
-            while stack:
-                current = stack.pop()
-                if current not in visited:
-                    visited.add(current)
-                    stack.extend(self.enemy_table[current].base_enemies)
-
-            # Placement enemy may not depend on placed enemy
-            if self.enemy_names[self.enemy_shuffle[index]] in visited:
-                return True
-
-        return False
+        # Placement enemy may not depend on placed enemy
+        return any(
+            placed_index in self.base_enemy_indices[placement_index]
+            for placement_index, placed_index in enumerate(self.enemy_shuffle)
+        )
 
     # Determine placement enemy for a placed enemy from the enemy shuffle
     def get_placement_enemy(self, placed_enemy: str) -> str:
-        placed_index = self.enemy_names.index(placed_enemy)
-        placement_index = self.enemy_shuffle.index(placed_index)
+        placed_index = self.enemy_name_to_index[placed_enemy]
+        placement_index = self.placement_indices[placed_index]
         placement_enemy = self.enemy_names[placement_index]
         return placement_enemy
 
     # Determine difficulty of a placed enemy from the (relative and base) difficulty of its placement
     def get_difficulty(self, placed_enemy: str | list[str]) -> float:
         if isinstance(placed_enemy, list):
-            return min([self.get_difficulty(enemy) for enemy in placed_enemy], default=0.0)
-        placement_enemy = self.get_placement_enemy(placed_enemy)
-        placement_base_difficulty = self.get_difficulty(self.enemy_table[placement_enemy].base_enemies)
-        placement_relative_difficulty = self.enemy_table[placement_enemy].difficulty
-        return placement_base_difficulty + placement_relative_difficulty
+            return min([self.difficulties[enemy] for enemy in placed_enemy], default=0.0)
+        return self.difficulties[placed_enemy]
+
+    # Same as get_difficulty, but for placed enemy indices
+    def get_index_difficulty(self, placed_indices: tuple[int, ...]) -> float:
+        return min([self.index_difficulties[index] for index in placed_indices], default=0.0)
 
     # Determine relative bucket of an enemy from the default buckets of it and its dependencies
     def get_relative_bucket(self, enemy: str) -> int:
@@ -1094,13 +1245,26 @@ class EnemyRandoManager:
     # Determine bucket of a placed enemy from the (relative and base) bucket of its placement
     def get_bucket(self, placed_enemy: str | list[str]) -> int:
         if isinstance(placed_enemy, list):
-            return min([self.get_bucket(enemy) for enemy in placed_enemy], default=0)
-        placement_enemy = self.get_placement_enemy(placed_enemy)
-        placement_base_bucket = self.get_bucket(self.enemy_table[placement_enemy].base_enemies)
-        placement_relative_bucket = self.get_relative_bucket(placement_enemy)
-        return max(placement_base_bucket + placement_relative_bucket, 0)
+            return min([self.buckets[enemy] for enemy in placed_enemy], default=0)
+        return self.buckets[placed_enemy]
 
     # Determine stat changes for a placed enemy from its placement bucket
     def get_stat_changes(self, placed_enemy: str) -> list[StatChange]:
         placement_bucket = self.get_bucket(placed_enemy)
         return self.enemy_table[placed_enemy].stat_changes.get(placement_bucket, [])
+
+    # Replace all quoted placement enemies in a config line by their placed enemies
+    def replace_placement_enemies(self, line: str) -> str:
+        return self.quoted_enemy_name_pattern.sub(lambda match: self.quoted_placed_enemies[match[1].lower()], line)
+
+    # Collect resolved data of all placed enemies at once, in order of enemy names
+    def get_placed_enemies_data(self) -> dict[str, PlacedEnemyData]:
+        return {
+            placed_enemy: PlacedEnemyData(
+                placement_enemy=self.get_placement_enemy(placed_enemy),
+                difficulty=self.difficulties[placed_enemy],
+                bucket=self.buckets[placed_enemy],
+                stat_changes=self.get_stat_changes(placed_enemy),
+            )
+            for placed_enemy in self.enemy_names
+        }
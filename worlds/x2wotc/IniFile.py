@@ -0,0 +1,94 @@
+import os
+import re
+
+
+VALUE_TOKEN_PATTERN = re.compile(r"\S*")
+
+
+# Write to a temporary file first, so a crash mid-write can't corrupt the file
+def write_file_atomic(path: str, text: str):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as file:
+        file.write(text)
+    os.replace(temp_path, path)
+
+
+class IniFile:
+    """
+    Minimal parsed model of an Unreal Engine config file, keeping track of sections and plain "Key=Value" entries.
+    Edits are applied line by line, and the file is only rewritten (atomically) if its content actually changed.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+
+        with open(path, "r") as file:
+            self.text: str = file.read()
+        self.lines: list[str] = self.text.split("\n")
+
+        self.sections: dict[str, tuple[int, int]] = {}  # Section name -> (first line, end line) of its body
+        self.entries: dict[str, list[int]] = {}  # Key -> lines of plain entries (not array operations like +Key=)
+        self.build_index()
+
+    def build_index(self):
+        self.sections = {}
+        self.entries = {}
+
+        section = None
+        section_start = 0
+        for index, line in enumerate(self.lines):
+            if line.startswith("[") and line.endswith("]"):
+                if section is not None:
+                    self.sections.setdefault(section, (section_start, index))
+                section = line[1:-1]
+                section_start = index + 1
+                continue
+
+            key, separator, _ = line.partition("=")
+            if separator and key and (key[0].isalnum() or key[0] == "_") and not any(c.isspace() for c in key):
+                self.entries.setdefault(key, []).append(index)
+
+        if section is not None:
+            self.sections.setdefault(section, (section_start, len(self.lines)))
+
+    def set_value(self, key: str, value: str):
+        # Only the first token of the value is replaced, anything after it on the same line is kept
+        for index in self.entries.get(key, []):
+            old_value = self.lines[index][len(key) + 1:]
+            old_token_end = VALUE_TOKEN_PATTERN.match(old_value).end()
+            self.lines[index] = f"{key}={value}{old_value[old_token_end:]}"
+
+    def set_values(self, values: dict[str, str]):
+        for key, value in values.items():
+            self.set_value(key, value)
+
+    def replace_block(self, section: str, begin_marker: str, end_marker: str, block: list[str]) -> bool:
+        # Replace all lines between the begin and end marker lines inside the given section
+        if section not in self.sections:
+            return False
+
+        section_start, section_end = self.sections[section]
+        try:
+            begin_index = self.lines.index(begin_marker, section_start, section_end)
+            end_index = self.lines.index(end_marker, begin_index + 1, section_end)
+        except ValueError:
+            return False
+
+        if self.lines[begin_index + 1:end_index] != block:
+            self.lines[begin_index + 1:end_index] = block
+            self.build_index()
+        return True
+
+    def replace_lines(self, lines: list[str]):
+        if lines != self.lines:
+            self.lines = lines
+            self.build_index()
+
+    def save(self) -> bool:
+        text = "\n".join(self.lines)
+        if text == self.text:
+            return False
+
+        write_file_atomic(self.path, text)
+        self.text = text
+        return True
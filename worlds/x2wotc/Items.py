@@ -1,4 +1,3 @@
-from copy import deepcopy
 from logging import warning
 from random import Random
 
@@ -87,6 +86,15 @@ for item_tag in item_tags:
         if item_data.id and item_tag in item_data.tags
     }
 
+# Default item counts
+# NOTE: not all non-filler items define normal_location,
+# those that don't must be added in generate_early
+default_item_count: dict[str, int] = {
+    item_name: 0 if item_data.normal_location is None else 1
+    for item_name, item_data in item_table.items()
+}
+default_num_items: int = sum(default_item_count.values())
+
 # Progressive item groups
 """
 for item_data in item_table.values():
@@ -111,7 +119,8 @@ class ItemManager:
     item_groups = item_groups
 
     def __init__(self):
-        self.item_table: dict[str, X2WOTCItemData] = deepcopy(item_table)
+        # Shallow copy, since item data is immutable and only ever swapped out by replace()
+        self.item_table: dict[str, X2WOTCItemData] = dict(item_table)
         self.locked: bool = False
 
         self.resource_items: set[str] = set(resource_item_table.keys())
@@ -121,20 +130,10 @@ class ItemManager:
         self.trap_items: set[str] = set(trap_item_table.keys())
         self.nothing_items: set[str] = set(nothing_items.keys())
 
-        self.item_count: dict[str, int] = {}
-        self.real_count: dict[str, int] = {}
-        self.num_items: int = 0
-
-        # NOTE: not all non-filler items define normal_location,
-        # those that don't must be added in generate_early
-        for item_name, item_data in self.item_table.items():
-            if item_data.normal_location is None:
-                self.item_count[item_name] = 0
-                self.real_count[item_name] = 0
-            else:
-                self.item_count[item_name] = 1
-                self.real_count[item_name] = 1
-                self.num_items += 1
+        self.item_count: dict[str, int] = default_item_count.copy()
+        self.real_count: dict[str, int] = default_item_count.copy()
+        self.num_items: int = default_num_items
+        self.total_power: float | None = None  # Computed once item counts have been locked
 
     def replace(self, item_name: str, **kwargs):
         if self.locked:
@@ -155,10 +154,16 @@ class ItemManager:
             ])
 
     def get_total_power(self) -> float:
-        return sum([
+        if self.total_power is not None:
+            return self.total_power
+
+        total_power = sum([
             self.get_item_power(item_name, count)
             for item_name, count in self.item_count.items()
         ])
+        if self.locked:
+            self.total_power = total_power
+        return total_power
 
     def set_item_count(self, item_name: str, new_count: int):
         if self.locked:
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from logging import warning
 from typing import TYPE_CHECKING
 
@@ -7,7 +6,7 @@ from BaseClasses import Location
 if TYPE_CHECKING:
     from worlds.x2wotc import X2WOTCWorld
 
-from .EnemyRando import EnemyRandoManager
+from .EnemyRando import EnemyRandoManager, enemy_name_to_index
 from .LocationData import X2WOTCLocationData, location_table
 
 from .mods import mod_locations
@@ -24,6 +23,20 @@ for loc_name, loc_data in mod_locations.items():
     else:
         warning(f"X2WOTC: Duplicate location {loc_name} in mods, skipping")
 
+# Enemy indices of difficulty tags for enemy rando ("diff:<enemy name>"), parsed once per location
+def get_diff_tag_enemy_indices(tags: set[str]) -> tuple[int, ...]:
+    return tuple(enemy_name_to_index[tag[5:]] for tag in tags if tag.startswith("diff:"))
+
+
+diff_tag_enemy_indices: dict[str, tuple[int, ...]] = {
+    loc_name: get_diff_tag_enemy_indices(loc_data.tags)
+    for loc_name, loc_data in location_table.items()
+}
+
+# Location difficulties of locked location managers, keyed on the enemy shuffle, the autopsy difficulty
+# and the difficulty inputs of replaced locations, shared between all players with identical location data
+location_difficulties_cache: dict[tuple, dict[str, float]] = {}
+
 # Lookup tables
 loc_display_name_to_id = {
     loc_data.display_name: loc_data.id
@@ -86,11 +99,17 @@ class LocationManager:
         self.enemy_rando_manager: EnemyRandoManager = world.enemy_rando_manager
         self.autopsy_difficulty: float = 3.0
 
-        self.location_table: dict[str, X2WOTCLocationData] = deepcopy(location_table)
+        # Shallow copy, since location data is immutable and only ever swapped out by replace()
+        self.location_table: dict[str, X2WOTCLocationData] = dict(location_table)
+        self.diff_tag_enemy_indices: dict[str, tuple[int, ...]] = dict(diff_tag_enemy_indices)
+        self.replaced_locations: set[str] = set()
         self.locked: bool = False
 
-        self.enabled: dict[str, bool] = {loc_name: True for loc_name in self.location_table.keys()}
-        self.num_locations: int = len(self.location_table)
+        # Computed once location data has been locked
+        self.location_difficulties: dict[str, float] | None = None
+
+        self.enabled: dict[str, bool] = dict.fromkeys(location_table, True)
+        self.num_locations: int = len(location_table)
 
     def replace(self, loc_name: str, **kwargs):
         if self.locked:
@@ -98,19 +117,62 @@ class LocationManager:
 
         loc_data = self.location_table[loc_name]
         self.location_table[loc_name] = loc_data.replace(**kwargs)
+        self.replaced_locations.add(loc_name)
+        if "tags" in kwargs:
+            self.diff_tag_enemy_indices[loc_name] = get_diff_tag_enemy_indices(kwargs["tags"])
 
     def get_location_difficulty(self, loc_name: str) -> float:
+        if self.locked:
+            return self.get_location_difficulties()[loc_name]
+
         loc_data = self.location_table[loc_name]
         base_difficulty = loc_data.difficulty
 
         # Handle difficulty tags for enemy rando
-        diff_tag_enemies = [tag[5:] for tag in loc_data.tags if tag.startswith("diff:")]
-        diff_tag_difficulty = self.enemy_rando_manager.get_difficulty(diff_tag_enemies)
+        diff_tag_difficulty = self.enemy_rando_manager.get_index_difficulty(self.diff_tag_enemy_indices[loc_name])
         if "autopsy" in loc_data.tags:
             diff_tag_difficulty += self.autopsy_difficulty  # Autopsies take time
 
         return max(base_difficulty, diff_tag_difficulty)
 
+    def get_location_difficulties(self) -> dict[str, float]:
+        if self.location_difficulties is not None:
+            return self.location_difficulties
+
+        # Location data can't change anymore after locking
+        if self.locked:
+            cache_key = (
+                self.enemy_rando_manager.shuffle_key,
+                self.autopsy_difficulty,
+                tuple(
+                    (
+                        loc_name,
+                        self.location_table[loc_name].difficulty,
+                        self.diff_tag_enemy_indices[loc_name],
+                        "autopsy" in self.location_table[loc_name].tags,
+                    )
+                    for loc_name in sorted(self.replaced_locations)
+                ),
+            )
+            if cache_key in location_difficulties_cache:
+                self.location_difficulties = location_difficulties_cache[cache_key]
+                return self.location_difficulties
+
+        index_difficulties = self.enemy_rando_manager.index_difficulties
+        location_difficulties = {}
+        for loc_name, loc_data in self.location_table.items():
+            diff_tag_difficulty = min(
+                [index_difficulties[index] for index in self.diff_tag_enemy_indices[loc_name]],
+                default=0.0
+            )
+            if "autopsy" in loc_data.tags:
+                diff_tag_difficulty += self.autopsy_difficulty  # Autopsies take time
+            location_difficulties[loc_name] = max(loc_data.difficulty, diff_tag_difficulty)
+
+        if self.locked:
+            self.location_difficulties = location_difficulties_cache[cache_key] = location_difficulties
+        return location_difficulties
+
     def disable_location(self, loc_name: str) -> bool:
         if self.locked:
             raise RuntimeError("Cannot disable locations after location manager has been locked.")
@@ -13,6 +13,9 @@ from .Locations import location_table, loc_id_to_key
 
 ctx: "X2WOTCContext"
 
+MAX_TICK_WAIT = 30.0  # Maximum time in seconds to hold a long-polling tick request
+CHECK_BATCH_DELAY = 0.25  # Time in seconds to collect location checks into a single message
+
 LocationsInfo = dict[
     str,  # Location name (internal)
     tuple[
@@ -49,24 +52,39 @@ async def scout_loop():
             await ctx.scouted.wait_clear()
             await ctx.connected.wait()
 
-            for loc_id in ctx.server_locations:  # If the server knows the location
-                if loc_id in loc_id_to_key.keys():  # If it's ours
-                    ctx.locations_scouted.add(loc_id)  # Scout it
+            # Only scout our locations the server knows about and that haven't been scouted yet
+            # (The cache survives reconnects to the same seed and slot)
+            ctx.locations_scouted = {
+                loc_id
+                for loc_id in ctx.server_locations
+                if loc_id in loc_id_to_key and loc_id not in ctx.scout_cache
+            }
 
             if ctx.locations_scouted:
                 await ctx.send_msgs([{
                     "cmd": "LocationScouts",
                     "locations": list(ctx.locations_scouted)
                 }])
+            else:
+                ctx.scouted.set()
 
             await ctx.scouted.wait()
-            ctx.fill_spoiler([{
-                "location": loc_id_to_key[loc_id],
-                "item": ctx.item_names.lookup_in_slot(item.item, item.player),
-                "player": ctx.slot_info[item.player].name,
-                "game": ctx.slot_info[item.player].game,
-                "flags": item.flags
-            } for loc_id, item in ctx.locations_info.items()])
+
+            # Only build spoiler entries for newly scouted locations, and skip the rewrite if there are none
+            new_entries = {
+                loc_id: {
+                    "location": loc_id_to_key[loc_id],
+                    "item": ctx.item_names.lookup_in_slot(item.item, item.player),
+                    "player": ctx.slot_info[item.player].name,
+                    "game": ctx.slot_info[item.player].game,
+                    "flags": item.flags
+                }
+                for loc_id, item in ctx.scout_cache.items()
+                if loc_id not in ctx.spoiler_entries and loc_id in loc_id_to_key
+            }
+            if new_entries or not ctx.spoiler_entries:
+                ctx.spoiler_entries.update(new_entries)
+                ctx.fill_spoiler(list(ctx.spoiler_entries.values()))
 
             logger.debug("Proxy: Locations scouted")
 
@@ -93,13 +111,13 @@ def get_locations_info(checks: list[str]) -> LocationsInfo:
             logger.debug(f"Proxy: Location {loc_name} already checked")
             continue
 
-        if loc_id not in ctx.locations_scouted:
+        if loc_id not in ctx.scout_cache:
             logger.debug(f"Proxy: Location {loc_name} not scouted, will be treated as disabled")
             item_name = loc_data.normal_item  # Send internal key for disabled locations
             locations_info[loc_name] = (item_name, None, None)
             continue
 
-        network_item = ctx.locations_info[loc_id]
+        network_item = ctx.scout_cache[loc_id]
         slot_info = get_slot_info(network_item.player)
 
         # Send external name for all locations touched by generation
@@ -112,7 +130,47 @@ def get_locations_info(checks: list[str]) -> LocationsInfo:
 
 # ----------------------------------------------------- CHECK -------------------------------------------------------- #
 
+# Location checks collected over a short window and sent to the server as a single message
+class CheckBatcher:
+    def __init__(self):
+        self.flush_task: asyncio.Task | None = None
+        self.reset()
+
+    # Location ids are the same in every seed, so this has to be reset when connecting to another room or slot
+    # (Checks still pending are resent by the client on connect, since they are part of locations_checked)
+    def reset(self):
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+        self.pending: set[int] = set()  # Checked in game, not yet sent
+        self.sent: set[int] = set()
+        self.flush_task = None
+
+    def add(self, loc_ids: set[int]):
+        self.pending |= loc_ids - self.sent - ctx.checked_locations
+        if self.pending and (self.flush_task is None or self.flush_task.done()):
+            self.flush_task = asyncio.create_task(self.flush(), name="check_batcher")
+
+    async def flush(self):
+        try:
+            # Checks added while a batch is being sent go into the next batch of the same task
+            while self.pending:
+                await asyncio.sleep(CHECK_BATCH_DELAY)
+                await ctx.connected.wait()  # Unsent checks are held until the client is reconnected
+
+                loc_ids = self.pending - ctx.checked_locations
+                self.pending = set()
+                if loc_ids:
+                    self.sent |= loc_ids
+                    await ctx.check_locations(loc_ids)
+                    logger.debug(f"Proxy: {len(loc_ids)} location check(s) sent")
+
+        except asyncio.CancelledError:
+            logger.debug("Proxy: Check batcher cancelled")
+
+check_batcher = CheckBatcher()
+
 async def send_checks(checks: list[str], connected: bool = True):
+    new_loc_ids: set[int] = set()
     for loc_name in checks:
         try:
             loc_id = location_table[loc_name].id
@@ -135,49 +193,83 @@ async def send_checks(checks: list[str], connected: bool = True):
             continue
 
         ctx.locations_checked.add(loc_id)
+        new_loc_ids.add(loc_id)
 
     if not connected:
-        logger.debug("Proxy: Client not connected, cannot send location checks")
-        return
+        logger.debug("Proxy: Client not connected, location checks will be sent after reconnecting")
 
-    await ctx.check_locations(ctx.locations_checked)
-    logger.debug("Proxy: Location checks sent")
+    check_batcher.add(new_loc_ids)
 
 # ---------------------------------------------------- RECEIVE ------------------------------------------------------- #
 
-def get_received_items(layer: str, number_received: int) -> ItemsInfo:
-    items_info: ItemsInfo = []
-    progressive_index: dict[str, int] = {}
-    number = 0  # Number in sequence of received items (from 1)
+# Received items translated and split by layer, only extended by items that arrived since the last update
+class ReceivedItemsCache:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.items_received: list[NetworkItem] | None = None  # Client list the cache was built from
+        self.num_processed: int = 0
+        self.progressive_index: dict[str, int] = {}
+        self.layer_items: dict[str, ItemsInfo] = {}
+        self.tick_responses: dict[str, dict[int, str]] = {}
+
+    def update(self):
+        # The client replaces its list of received items when the server resends them from the start
+        if self.items_received is not ctx.items_received or self.num_processed > len(ctx.items_received):
+            self.reset()
+            self.items_received = ctx.items_received
+
+        if self.num_processed == len(ctx.items_received):
+            return
+
+        for network_item in ctx.items_received[self.num_processed:]:
+            item_name = item_id_to_key[network_item.item]
+            item_data = item_table[item_name]
 
-    for network_item in ctx.items_received:
-        item_name = item_id_to_key[network_item.item]
-        item_data = item_table[item_name]
+            # Track progressive items
+            stages = item_data.stages
+            if stages is not None:
+                self.progressive_index[item_name] = self.progressive_index.get(item_name, -1) + 1
 
-        # Track progressive items
-        stages = item_data.stages
-        if stages is not None:
-            progressive_index[item_name] = progressive_index.get(item_name, -1) + 1
+            if item_data.type == "Nothing":
+                continue
 
-        if item_data.layer != layer or item_data.type == "Nothing":
-            continue
+            # Translate progressive items
+            if stages is not None:
+                index = self.progressive_index[item_name]
+                if index < len(stages):
+                    stage = stages[index]
+                    if stage is not None:
+                        item_name = stage
 
-        number += 1
-        if number <= number_received:
-            continue
+            slot_info = get_slot_info(network_item.player)
+            self.layer_items.setdefault(item_data.layer, []).append((item_name, network_item, slot_info))
 
-        # Translate progressive items
-        if stages is not None:
-            index = progressive_index[item_name]
-            if index < len(stages):
-                stage = stages[index]
-                if stage is not None:
-                    item_name = stage
+        self.num_processed = len(ctx.items_received)
+        self.tick_responses = {}
 
-        slot_info = get_slot_info(network_item.player)
-        items_info.append((item_name, network_item, slot_info))
+received_items_cache = ReceivedItemsCache()
 
-    return items_info
+def get_received_items(layer: str, number_received: int) -> ItemsInfo:
+    received_items_cache.update()
+    return received_items_cache.layer_items.get(layer, [])[number_received:]
+
+def has_received_items(layer: str, number_received: int) -> bool:
+    received_items_cache.update()
+    return len(received_items_cache.layer_items.get(layer, [])) > number_received
+
+async def wait_for_received_items(layer: str, number_received: int, wait: float):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while ctx.connected.is_set() and not has_received_items(layer, number_received):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return
+        try:
+            await asyncio.wait_for(ctx.received_items_event.wait(), remaining)
+        except asyncio.TimeoutError:
+            return
 
 #======================================================================================================================#
 #                                                  REQUEST HANDLERS                                                    #
@@ -252,6 +344,12 @@ async def handle_hint(request: web.Request):
 # ----------------------------------------------------- TICK --------------------------------------------------------- #
 
 def handle_tick(layer: str, number_received: int) -> str:
+    # Reuse the response as long as no new items have arrived
+    received_items_cache.update()
+    tick_responses = received_items_cache.tick_responses.get(layer)
+    if tick_responses is not None and number_received in tick_responses:
+        return tick_responses[number_received]
+
     # Send state back for verification
     response_body = f"{number_received}"
 
@@ -274,23 +372,34 @@ def handle_tick(layer: str, number_received: int) -> str:
             response_body += "Archipelago Item Received\n"
             response_body += f"Received {item_data.display_name} from the server."
 
+    received_items_cache.tick_responses.setdefault(layer, {})[number_received] = response_body
     return response_body
 
-async def handle_tick_strategy(request: web.Request):
+async def handle_tick_layer(request: web.Request, layer: str) -> web.Response:
     if not ctx.connected.is_set():
         return web.Response(status=503)
-    
+
     number_received = int(request.match_info["tail"])
-    response_body = handle_tick("Strategy", number_received)
+
+    # Long-polling: with ?wait=<seconds>, hold the request until new items arrive or the time is up
+    if "wait" in request.query:
+        try:
+            wait = min(float(request.query["wait"]), MAX_TICK_WAIT)
+        except ValueError:
+            return web.Response(status=400)
+
+        await wait_for_received_items(layer, number_received, wait)
+        if not ctx.connected.is_set():
+            return web.Response(status=503)
+
+    response_body = handle_tick(layer, number_received)
     return web.Response(text=response_body)
 
+async def handle_tick_strategy(request: web.Request):
+    return await handle_tick_layer(request, "Strategy")
+
 async def handle_tick_tactical(request: web.Request):
-    if not ctx.connected.is_set():
-        return web.Response(status=503)
-    
-    number_received = int(request.match_info["tail"])
-    response_body = handle_tick("Tactical", number_received)
-    return web.Response(text=response_body)
+    return await handle_tick_layer(request, "Tactical")
 
 #======================================================================================================================#
 #                                                     RUN PROXY                                                        #
@@ -299,6 +408,7 @@ async def handle_tick_tactical(request: web.Request):
 async def run_proxy(local_ctx: "X2WOTCContext"):
     global ctx
     ctx = local_ctx
+    received_items_cache.reset()
 
     address = ("localhost", ctx.proxy_port)
     
@@ -324,4 +434,7 @@ async def run_proxy(local_ctx: "X2WOTCContext"):
         await runner.cleanup()
         scout_task.cancel()
         await scout_task
+        if check_batcher.flush_task:
+            check_batcher.flush_task.cancel()
+            await check_batcher.flush_task
         logger.debug("Proxy: Server stopped")
@@ -1,3 +1,4 @@
+from bisect import bisect_left
 from collections import defaultdict
 from typing import Callable, TYPE_CHECKING
 
@@ -13,14 +14,16 @@ if TYPE_CHECKING:
 from .ItemData import GOAL_VALUE_TO_ITEM
 
 
-# Cache per-state current power values
+# Track per-state current power values, updated incrementally on collect/remove
 class X2WOTCState(LogicMixin):
-    x2wotc_power_stale: dict[int, bool]
-    x2wotc_power_cache: dict[int, float]
+    x2wotc_power: dict[int, float]
 
     def init_mixin(self, _):
-        self.x2wotc_power_stale = defaultdict(lambda: True)
-        self.x2wotc_power_cache = defaultdict(lambda: 0.0)
+        self.x2wotc_power = defaultdict(float)
+
+    def copy_mixin(self, new_state: CollectionState) -> CollectionState:
+        new_state.x2wotc_power = self.x2wotc_power.copy()
+        return new_state
 
 
 class RuleManager:
@@ -34,30 +37,48 @@ class RuleManager:
         # Precompute per-location required power values
         total_power = self.item_manager.get_total_power()
         self.req_power_lookup: dict[str, float] = {
-            loc_name: self.loc_manager.get_location_difficulty(loc_name) * total_power / 100.0
-            for loc_name in self.loc_manager.location_table.keys()
+            loc_name: difficulty * total_power / 100.0
+            for loc_name, difficulty in self.loc_manager.get_location_difficulties().items()
         }
 
-        # Compile all items that could affect power
-        self.power_items: set[str] = {
-            item_data.display_name
-            for item_data in self.item_manager.item_table.values()
-            if item_data.power > 0.0 or item_data.stages is not None
-        }
+        # Precompute per-item power gained by each additional copy (index i: from count i to count i + 1)
+        self.power_steps: dict[str, list[float]] = {}
+        for item_name, item_data in self.item_manager.item_table.items():
+            if item_data.power <= 0.0 and item_data.stages is None:
+                continue
+
+            if item_data.stages is not None:
+                max_count = len(item_data.stages)
+            else:
+                max_count = self.item_manager.item_count[item_name]
+            powers = [self.item_manager.get_item_power(item_name, count) for count in range(max_count + 1)]
+            power_steps = [powers[count + 1] - powers[count] for count in range(max_count)]
+            if any(power_steps):
+                self.power_steps[item_data.display_name] = power_steps
+
+        # Precompute stage positions of each item within progressive items (by display name of the progressive item)
+        self.stage_lookup: dict[str, list[tuple[str, list[int]]]] = {}
+        for item_data in self.item_manager.item_table.values():
+            if item_data.stages is None:
+                continue
+
+            stage_positions: dict[str, list[int]] = {}
+            for position, stage in enumerate(item_data.stages):
+                if stage is not None:
+                    stage_positions.setdefault(stage, []).append(position)
+            for stage, positions in stage_positions.items():
+                self.stage_lookup.setdefault(stage, []).append((item_data.display_name, positions))
 
     #==================================================================================================================#
     #                                               GENERAL HELPERS                                                    #
     #------------------------------------------------------------------------------------------------------------------#
 
     def get_item_count(self, state: CollectionState, item: str) -> int:
-        total_count = 0
-        for display_name, count in state.prog_items[self.player].items():
-            item_key = self.item_manager.item_display_name_to_key[display_name]
-            item_data = self.item_manager.item_table[item_key]
-            if item_key == item:
-                total_count += count
-            elif item_data.stages is not None:
-                total_count += item_data.stages[:count].count(item)
+        prog_items = state.prog_items[self.player]
+        total_count = prog_items[self.item_manager.item_table[item].display_name]
+        for progressive_name, positions in self.stage_lookup.get(item, []):
+            # Number of stage positions unlocked by the progressive count
+            total_count += bisect_left(positions, prog_items[progressive_name])
         return total_count
 
     def has_item_or_impossible(self, state: CollectionState, item: str, count: int = 1) -> bool:
@@ -81,15 +102,15 @@ class RuleManager:
     #                                             POWER RULE HELPERS                                                   #
     #------------------------------------------------------------------------------------------------------------------#
 
+    # Power gained by going from count - 1 to count copies of an item (by display name)
+    def get_power_step(self, display_name: str, count: int) -> float:
+        power_steps = self.power_steps.get(display_name)
+        if power_steps is None or not 0 < count <= len(power_steps):
+            return 0.0
+        return power_steps[count - 1]
+
     def get_current_power(self, state: CollectionState) -> float:
-        if state.x2wotc_power_stale[self.player]:
-            state.x2wotc_power_cache[self.player] = sum([
-                self.item_manager.get_item_power(self.item_manager.item_display_name_to_key[display_name], count)
-                for display_name, count in state.prog_items[self.player].items()
-            ])
-            state.x2wotc_power_stale[self.player] = False
-
-        return state.x2wotc_power_cache[self.player]
+        return state.x2wotc_power[self.player]
 
     def can_reasonably_reach(self, state: CollectionState, location: str) -> bool:
         req_power = self.req_power_lookup[location]
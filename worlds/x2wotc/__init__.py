@@ -19,7 +19,7 @@ from .Regions import RegionManager
 from .Rules import RuleManager
 from .Version import CLIENT_NAME, GAME_NAME, world_minimum_client_version
 
-from .mods import mods_data
+from .mods import get_mods_data
 
 
 def launch_client(*args):
@@ -113,12 +113,12 @@ class X2WOTCWorld(World):
             self.enemy_rando_manager.set_enemy_shuffle(slot_data["enemy_shuffle"])
 
         # Disable inactive mods
-        for mod_data in mods_data:
-            if mod_data.name not in self.options.active_mods:
-                for item_name, item_data in mod_data.items.items():
-                    self.item_manager.disable_item(item_name)
-                for loc_name, loc_data in mod_data.locations.items():
-                    self.loc_manager.disable_location(loc_name)
+        _, inactive_mods_data = get_mods_data(frozenset(self.options.active_mods.value))
+        for mod_data in inactive_mods_data:
+            for item_name, item_data in mod_data.items.items():
+                self.item_manager.disable_item(item_name)
+            for loc_name, loc_data in mod_data.locations.items():
+                self.loc_manager.disable_location(loc_name)
 
         # Disable contact techs
         # This always happens for now, while I haven't committed to MCO-ing XComHQ
@@ -228,8 +228,9 @@ class X2WOTCWorld(World):
             self.enemy_rando_manager.shuffle_enemies(self.options.enemy_plando, self.random)
 
         # Handle mod options
-        for mod_data in mods_data:
-            if mod_data.generate_early and mod_data.name in self.options.active_mods:
+        active_mods_data, _ = get_mods_data(frozenset(self.options.active_mods.value))
+        for mod_data in active_mods_data:
+            if mod_data.generate_early:
                 mod_data.generate_early(self)
 
         # Remove corpse cost logic (after mod options, in case mods add corpse costs)
@@ -313,8 +314,9 @@ class X2WOTCWorld(World):
     def set_rules(self):
         self.rule_manager.set_rules()
 
-        for mod_data in mods_data:
-            if mod_data.set_rules and mod_data.name in self.options.active_mods:
+        active_mods_data, _ = get_mods_data(frozenset(self.options.active_mods.value))
+        for mod_data in active_mods_data:
+            if mod_data.set_rules:
                 mod_data.set_rules(self)
 
     def get_filler_item_name(self) -> str:
@@ -328,17 +330,19 @@ class X2WOTCWorld(World):
             self.random
         )
 
-    # Invalidate power cache on collect/remove
+    # Update current power on collect/remove
     def collect(self, state: CollectionState, item: Item) -> bool:
         change = super().collect(state, item)
-        if change and item.name in self.rule_manager.power_items:
-            state.x2wotc_power_stale[self.player] = True
+        if change and item.name in self.rule_manager.power_steps:
+            count = state.prog_items[self.player][item.name]
+            state.x2wotc_power[self.player] += self.rule_manager.get_power_step(item.name, count)
         return change
 
     def remove(self, state: CollectionState, item: Item) -> bool:
         change = super().remove(state, item)
-        if change and item.name in self.rule_manager.power_items:
-            state.x2wotc_power_stale[self.player] = True
+        if change and item.name in self.rule_manager.power_steps:
+            count = state.prog_items[self.player][item.name]
+            state.x2wotc_power[self.player] -= self.rule_manager.get_power_step(item.name, count + 1)
         return change
 
     def fill_slot_data(self):
@@ -1,4 +1,6 @@
+from functools import cache
 import importlib
+import importlib.util
 from logging import warning
 import pkgutil
 from typing import NamedTuple, Callable, TYPE_CHECKING
@@ -11,8 +13,14 @@ from worlds.x2wotc.ItemData import X2WOTCItemData
 from worlds.x2wotc.LocationData import X2WOTCLocationData
 
 
+# Submodule of a mod package holding its generation and client hooks,
+# only imported for active mods
+HOOKS_MODULE_NAME = "Hooks"
+
+
 class X2WOTCModData(NamedTuple):
     name: str
+    module_name: str
     rule_priority: float = 0.0
     items: dict[str, X2WOTCItemData] = {}
     locations: dict[str, X2WOTCLocationData] = {}
@@ -23,13 +31,17 @@ class X2WOTCModData(NamedTuple):
 
 
 mods_data: list[X2WOTCModData] = []
+mods_data_by_name: dict[str, X2WOTCModData] = {}
 
 mod_names: list[str] = []
 mod_items: dict[str, X2WOTCItemData] = {}
 mod_locations: dict[str, X2WOTCLocationData] = {}
 mod_options: list[tuple[str, type[Option]]] = []
+mod_option_names: set[str] = set()
 
 # Collect mod data from directories
+# (Item, location and option tables are imported for every installed mod, since IDs are assigned at import time
+# and the data package has to list all of them; hooks are loaded from the Hooks submodule in get_mods_data)
 for loader, module_name, ispkg in pkgutil.iter_modules(__path__):
     try:
         module = importlib.import_module(f".{module_name}", __name__)
@@ -39,13 +51,11 @@ for loader, module_name, ispkg in pkgutil.iter_modules(__path__):
 
     mods_data.append(X2WOTCModData(
         name = module.name if hasattr(module, "name") else module_name,
+        module_name = module.__name__,
         rule_priority = module.rule_priority if hasattr(module, "rule_priority") else 0,
         items = module.items if hasattr(module, "items") else {},
         locations = module.locations if hasattr(module, "locations") else {},
-        set_rules = module.set_rules if hasattr(module, "set_rules") else None,
         options = module.options if hasattr(module, "options") else [],
-        generate_early = module.generate_early if hasattr(module, "generate_early") else None,
-        config = module.config if hasattr(module, "config") else {}
     ))
 
 # Sort mods by rule priority
@@ -53,8 +63,9 @@ mods_data.sort(key=lambda x: x.rule_priority)
 
 # Flatten mod data and check for duplicates
 for mod_data in mods_data:
-    if mod_data.name not in mod_names:
+    if mod_data.name not in mods_data_by_name:
         mod_names.append(mod_data.name)
+        mods_data_by_name[mod_data.name] = mod_data
     else:
         warning(f"X2WOTC: Duplicate mod name {mod_data.name}")
 
@@ -71,10 +82,40 @@ for mod_data in mods_data:
             warning(f"X2WOTC: Duplicate location name {loc_name} in mod {mod_data.name}")
 
     for option in mod_data.options:
-        if option[0] not in [mod_option[0] for mod_option in mod_options]:
+        if option[0] not in mod_option_names:
             mod_options.append(option)
+            mod_option_names.add(option[0])
         else:
             warning(f"X2WOTC: Duplicate option name {option[0]} in mod {mod_data.name}")
 
 # Sort mod names alphabetically
 mod_names.sort()
+
+
+# Import the hooks of a mod, either from its Hooks submodule or, for single file mods
+# and packages without one, from the mod module itself
+def load_mod_hooks(mod_data: X2WOTCModData) -> X2WOTCModData:
+    module = importlib.import_module(mod_data.module_name)
+    if hasattr(module, "__path__"):
+        hooks_module_name = f"{mod_data.module_name}.{HOOKS_MODULE_NAME}"
+        if importlib.util.find_spec(hooks_module_name) is not None:
+            try:
+                module = importlib.import_module(hooks_module_name)
+            except ImportError as e:
+                warning(f"X2WOTC: Failed to import hooks for mod {mod_data.name}, {e}")
+                return mod_data
+
+    return mod_data._replace(
+        set_rules = module.set_rules if hasattr(module, "set_rules") else None,
+        generate_early = module.generate_early if hasattr(module, "generate_early") else None,
+        config = module.config if hasattr(module, "config") else {}
+    )
+
+
+# Split mods into active ones with hooks loaded and inactive ones (both sorted by rule priority),
+# shared between all players with the same mod selection
+@cache
+def get_mods_data(active_mods: frozenset[str]) -> tuple[tuple[X2WOTCModData, ...], tuple[X2WOTCModData, ...]]:
+    active_mods_data = tuple(load_mod_hooks(mod_data) for mod_data in mods_data if mod_data.name in active_mods)
+    inactive_mods_data = tuple(mod_data for mod_data in mods_data if mod_data.name not in active_mods)
+    return active_mods_data, inactive_mods_data
@@ -0,0 +1,4 @@
+config: dict[str, str] = {
+    "X2Item_ResearchCompleted": "+CheckCompleteTechs=(TechName=Autopsy_AshFlameViper)",
+    "X2EventListener_WOTCArchipelago": "+CheckKillDefaultCharacterGroups=AshFlameViper",
+}
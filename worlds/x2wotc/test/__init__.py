@@ -0,0 +1,8 @@
+from test.bases import WorldTestBase
+
+from .. import X2WOTCWorld
+
+
+class X2WOTCTestBase(WorldTestBase):
+    game = "XCOM 2 War of the Chosen"
+    world: X2WOTCWorld
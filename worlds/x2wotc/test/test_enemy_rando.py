@@ -0,0 +1,149 @@
+from random import Random
+import unittest
+
+from Options import OptionError
+
+from ..EnemyRando import EnemyRandoManager, enemy_table
+
+
+class TestEnemyRando(unittest.TestCase):
+    def swapped_shuffle(self, manager: EnemyRandoManager, *pairs: tuple[str, str]) -> list[int]:
+        enemy_shuffle = list(range(len(manager.enemy_names)))
+        for enemy_a, enemy_b in pairs:
+            index_a = manager.enemy_name_to_index[enemy_a]
+            index_b = manager.enemy_name_to_index[enemy_b]
+            enemy_shuffle[index_a], enemy_shuffle[index_b] = index_b, index_a
+        return enemy_shuffle
+
+    def test_resolve_unshuffled(self):
+        manager = EnemyRandoManager()
+        for enemy_name, enemy_data in enemy_table.items():
+            with self.subTest(enemy=enemy_name):
+                self.assertEqual(manager.get_placement_enemy(enemy_name), enemy_name)
+                if not enemy_data.base_enemies:
+                    self.assertEqual(manager.get_difficulty(enemy_name), enemy_data.difficulty)
+                    self.assertEqual(manager.get_bucket(enemy_name), enemy_data.bucket)
+        self.assertEqual(manager.get_difficulty("AndromedonRobot"), enemy_table["Andromedon"].difficulty)
+        self.assertEqual(manager.get_bucket("AndromedonRobot"), enemy_table["AndromedonRobot"].bucket)
+        self.assertEqual(
+            manager.index_difficulties,
+            [manager.difficulties[enemy_name] for enemy_name in manager.enemy_names]
+        )
+
+    def test_resolve_through_base_enemies(self):
+        # AndromedonRobot spawns from whatever is placed into Andromedon's placement, here Sectoid's placement
+        manager = EnemyRandoManager()
+        manager.set_enemy_shuffle(self.swapped_shuffle(manager, ("Andromedon", "Sectoid")))
+        self.assertEqual(manager.get_placement_enemy("Andromedon"), "Sectoid")
+        self.assertEqual(manager.get_difficulty("Andromedon"), enemy_table["Sectoid"].difficulty)
+        self.assertEqual(manager.get_difficulty("AndromedonRobot"), enemy_table["Sectoid"].difficulty)
+        self.assertEqual(manager.get_bucket("Andromedon"), enemy_table["Sectoid"].bucket)
+        self.assertEqual(manager.get_bucket("AndromedonRobot"), enemy_table["Sectoid"].bucket - 1)
+        self.assertEqual(manager.get_difficulty(["Andromedon", "Viper"]), enemy_table["Sectoid"].difficulty)
+
+    def test_resolve_loop(self):
+        manager = EnemyRandoManager()
+        with self.assertRaises(Exception):
+            manager.set_enemy_shuffle(self.swapped_shuffle(manager, ("Andromedon", "AndromedonRobot")))
+
+    def test_repair_placements(self):
+        manager = EnemyRandoManager()
+        andromedon = manager.enemy_name_to_index["Andromedon"]
+        robot = manager.enemy_name_to_index["AndromedonRobot"]
+        sectoid = manager.enemy_name_to_index["Sectoid"]
+        placement_indices = [andromedon, robot, sectoid]
+
+        # Only AndromedonRobot's placement is invalid, so Sectoid's placement keeps its placed enemy
+        placed_indices = manager.repair_placements(placement_indices, [sectoid, andromedon, robot])
+        self.assertEqual(placed_indices, [andromedon, sectoid, robot])
+
+        # Valid placements are returned unchanged
+        placed_indices = manager.repair_placements(placement_indices, [robot, sectoid, andromedon])
+        self.assertEqual(placed_indices, [robot, sectoid, andromedon])
+
+    def test_shuffle_without_loops(self):
+        # Swapping the two would be a loop, so every shuffle of this group has to be repaired back to the identity
+        andromedons = ["Andromedon", "AndromedonRobot"]
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                manager = EnemyRandoManager()
+                manager.shuffle_enemies({"forced": [[andromedons, andromedons]], "fixed": []}, Random(seed))
+                self.assertEqual(manager.get_placement_enemy("AndromedonRobot"), "AndromedonRobot")
+                self.assertFalse(manager.has_base_enemies_loop())
+
+                manager = EnemyRandoManager()
+                manager.shuffle_enemies({"forced": [], "fixed": []}, Random(seed))
+                self.assertEqual(sorted(manager.enemy_shuffle), list(range(len(manager.enemy_names))))
+                self.assertFalse(manager.has_base_enemies_loop())
+
+    def test_impossible_enemy_plando(self):
+        manager = EnemyRandoManager()
+        with self.assertRaises(OptionError):
+            manager.shuffle_enemies({"forced": [[["AndromedonRobot"], ["Andromedon"]]], "fixed": []}, Random(0))
+
+    def test_match_enemy_filters(self):
+        manager = EnemyRandoManager()
+        filter_lists = [
+            [], ["Muton"], ["Andromedon"], ["Adv"], ["Andromedon", "Spectre", "M3"], ["M."], ["Viper", "Vip"]
+        ]
+        for filters in filter_lists:
+            with self.subTest(filters=filters):
+                expected = {
+                    enemy_index
+                    for enemy_index, enemy_name in enumerate(manager.enemy_names)
+                    if any(manager.evaluate_enemy_filter(filter, enemy_name) for filter in filters)
+                }
+                self.assertEqual(manager.match_enemy_filters(filters), expected)
+
+        # Exact names only match themselves, everything else is a literal substring
+        self.assertEqual(manager.match_enemy_filters(["Andromedon"]), {manager.enemy_name_to_index["Andromedon"]})
+        self.assertEqual(manager.match_enemy_filters(["M."]), frozenset())
+
+    def test_match_enemy_filters_cache(self):
+        manager = EnemyRandoManager()
+        enemy_indices = manager.match_enemy_filters(["Sectoid", "Adv"])
+        self.assertIs(manager.enemy_filter_cache[("Sectoid", "Adv")], enemy_indices)
+        self.assertIs(EnemyRandoManager().match_enemy_filters(["Sectoid", "Adv"]), enemy_indices)
+        self.assertNotEqual(manager.match_enemy_filters(["Adv"]), enemy_indices)
+
+    def test_replace_placement_enemies(self):
+        manager = EnemyRandoManager()
+        line = '-EncounterList=(ListID="Sectoids", TemplateName="sectoid", Enemy="Viper", Name="Sectoid_Patrol")'
+        self.assertEqual(manager.replace_placement_enemies(line), line.replace('"sectoid"', '"Sectoid"'))
+
+        manager.set_enemy_shuffle(self.swapped_shuffle(manager, ("Sectoid", "Viper"), ("Muton", "Archon")))
+        self.assertEqual(
+            manager.replace_placement_enemies(line),
+            '-EncounterList=(ListID="Sectoids", TemplateName="Viper", Enemy="Sectoid", Name="Sectoid_Patrol")'
+        )
+
+        # Every placement is replaced from the original line, so swapped enemies aren't replaced twice
+        self.assertEqual(manager.replace_placement_enemies('("Muton","Archon","Muton")'), '("Archon","Muton","Archon")')
+        self.assertEqual(manager.replace_placement_enemies('"MutonM2" Muton "Mutons"'), '"MutonM2" Muton "Mutons"')
+
+    def test_resolved_shuffle_cache(self):
+        manager = EnemyRandoManager()
+        unshuffled = manager.enemy_shuffle.copy()
+        difficulties = manager.difficulties
+
+        manager.set_enemy_shuffle(self.swapped_shuffle(manager, ("Sectoid", "Viper")))
+        self.assertEqual(manager.get_difficulty("Sectoid"), enemy_table["Viper"].difficulty)
+        manager.set_enemy_shuffle(unshuffled)
+        self.assertIs(manager.difficulties, difficulties)
+
+        # Managers with the same enemy shuffle share the resolved shuffle
+        other_manager = EnemyRandoManager()
+        self.assertIs(other_manager.difficulties, difficulties)
+        other_manager.set_enemy_shuffle(self.swapped_shuffle(other_manager, ("Sectoid", "Viper")))
+        manager.set_enemy_shuffle(self.swapped_shuffle(manager, ("Sectoid", "Viper")))
+        self.assertIs(manager.index_difficulties, other_manager.index_difficulties)
+        self.assertEqual(manager.shuffle_key, other_manager.shuffle_key)
+
+        # Managers with other enemy data don't reuse resolved shuffles of the same enemy shuffle
+        class ModdedEnemyRandoManager(EnemyRandoManager):
+            enemy_table = {**enemy_table, "Sectoid": enemy_table["Sectoid"]._replace(difficulty=99.0)}
+
+        modded_manager = ModdedEnemyRandoManager()
+        self.assertEqual(modded_manager.get_difficulty("Sectoid"), 99.0)
+        self.assertEqual(EnemyRandoManager().get_difficulty("Sectoid"), enemy_table["Sectoid"].difficulty)
+        self.assertNotEqual(modded_manager.shuffle_key, EnemyRandoManager().shuffle_key)
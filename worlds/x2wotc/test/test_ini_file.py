@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+from ..IniFile import IniFile, write_file_atomic
+
+
+CONFIG_TEXT = """[WOTCArchipelago.Settings]
+; Comment=Value
+DebugLogging=false ; Trailing comment
++ArrayEntry=Value
+CampaignSeed=0
+
+[WOTCArchipelago.Items]
+; BEGIN AUTO CODE
+OldEntry=1
+; END AUTO CODE
+DebugLogging=true"""
+
+
+class TestIniFile(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "XComWOTCArchipelago.ini")
+        write_file_atomic(self.path, CONFIG_TEXT)
+
+    def read(self) -> str:
+        with open(self.path, "r") as file:
+            return file.read()
+
+    def test_write_file_atomic(self):
+        self.assertEqual(self.read(), CONFIG_TEXT)
+        write_file_atomic(self.path, "Replaced")
+        self.assertEqual(self.read(), "Replaced")
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+    def test_index(self):
+        config = IniFile(self.path)
+        self.assertEqual(config.sections, {"WOTCArchipelago.Settings": (1, 6), "WOTCArchipelago.Items": (7, 11)})
+        self.assertEqual(config.entries, {"DebugLogging": [2, 10], "CampaignSeed": [4], "OldEntry": [8]})
+
+    def test_set_values(self):
+        config = IniFile(self.path)
+        config.set_values({"DebugLogging": "true", "CampaignSeed": "1234", "Missing": "1"})
+        self.assertEqual(config.lines[2], "DebugLogging=true ; Trailing comment")
+        self.assertEqual(config.lines[4], "CampaignSeed=1234")
+        self.assertEqual(config.lines[10], "DebugLogging=true")
+        self.assertEqual(config.lines[3], "+ArrayEntry=Value")
+
+    def test_replace_block(self):
+        config = IniFile(self.path)
+        section = "WOTCArchipelago.Items"
+        self.assertTrue(config.replace_block(section, "; BEGIN AUTO CODE", "; END AUTO CODE", ["New=1", "New=2"]))
+        self.assertEqual(config.lines[7:11], ["; BEGIN AUTO CODE", "New=1", "New=2", "; END AUTO CODE"])
+        self.assertEqual(config.sections[section], (7, 12))
+        self.assertEqual(config.entries["New"], [8, 9])
+        self.assertNotIn("OldEntry", config.entries)
+
+        # Markers have to be inside the section
+        self.assertFalse(config.replace_block("WOTCArchipelago.Settings", "; BEGIN AUTO CODE", "; END AUTO CODE", []))
+        self.assertFalse(config.replace_block("Missing", "; BEGIN AUTO CODE", "; END AUTO CODE", []))
+
+    def test_save(self):
+        config = IniFile(self.path)
+        self.assertFalse(config.save())
+
+        config.set_value("CampaignSeed", "0")
+        self.assertFalse(config.save())
+
+        config.replace_lines(config.lines[:5])
+        self.assertTrue(config.save())
+        self.assertEqual(self.read(), "\n".join(CONFIG_TEXT.split("\n")[:5]))
+        self.assertFalse(config.save())
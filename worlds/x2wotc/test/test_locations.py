@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+import unittest
+
+from ..EnemyRando import EnemyRandoManager
+from ..Locations import LocationManager, diff_tag_enemy_indices
+
+
+class TestLocationDifficulties(unittest.TestCase):
+    def make_loc_manager(self, enemy_rando_manager: EnemyRandoManager | None = None) -> LocationManager:
+        world = SimpleNamespace(enemy_rando_manager=enemy_rando_manager or EnemyRandoManager())
+        return LocationManager(world)
+
+    def test_batch_matches_single(self):
+        loc_manager = self.make_loc_manager()
+        unlocked_difficulties = {
+            loc_name: loc_manager.get_location_difficulty(loc_name) for loc_name in loc_manager.location_table
+        }
+        self.assertEqual(loc_manager.get_location_difficulties(), unlocked_difficulties)
+        loc_manager.locked = True
+        self.assertEqual(loc_manager.get_location_difficulties(), unlocked_difficulties)
+
+    def test_shared_between_identical_managers(self):
+        loc_manager = self.make_loc_manager()
+        other_loc_manager = self.make_loc_manager()
+        loc_manager.locked = other_loc_manager.locked = True
+        self.assertIs(loc_manager.get_location_difficulties(), other_loc_manager.get_location_difficulties())
+
+    def test_not_shared_between_different_managers(self):
+        loc_name = next(loc_name for loc_name, enemy_indices in diff_tag_enemy_indices.items() if enemy_indices)
+        difficulties = self.make_loc_manager()
+        difficulties.locked = True
+
+        # Replaced location data
+        replaced = self.make_loc_manager()
+        replaced.replace(loc_name, difficulty=99.0)
+        replaced.locked = True
+        self.assertEqual(replaced.get_location_difficulties()[loc_name], 99.0)
+        self.assertNotEqual(difficulties.get_location_difficulties()[loc_name], 99.0)
+
+        # Other enemy shuffle
+        enemy_rando_manager = EnemyRandoManager()
+        enemy_shuffle = list(range(len(enemy_rando_manager.enemy_names)))
+        enemy_shuffle.reverse()
+        enemy_rando_manager.enemy_shuffle = enemy_shuffle
+        enemy_rando_manager.resolve_enemy_shuffle()
+        shuffled = self.make_loc_manager(enemy_rando_manager)
+        shuffled.locked = True
+        self.assertIsNot(shuffled.get_location_difficulties(), difficulties.get_location_difficulties())
+        self.assertEqual(
+            shuffled.get_location_difficulties()[loc_name],
+            shuffled.get_location_difficulty(loc_name)
+        )
@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch
+
+from .. import mods
+from ..mods import get_mods_data, load_mod_hooks, mods_data_by_name
+from . import X2WOTCTestBase
+
+
+LWOTC = "Long War of the Chosen"
+FLAME_VIPER = "Flame Viper - WotC"
+
+
+class TestModRegistry(unittest.TestCase):
+    def setUp(self):
+        get_mods_data.cache_clear()
+        self.addCleanup(get_mods_data.cache_clear)
+
+    def test_metadata_without_hooks(self):
+        for mod_name, mod_data in mods_data_by_name.items():
+            with self.subTest(mod=mod_name):
+                self.assertIsNone(mod_data.generate_early)
+                self.assertIsNone(mod_data.set_rules)
+                self.assertEqual(mod_data.config, {})
+
+    def test_load_hooks(self):
+        lwotc = load_mod_hooks(mods_data_by_name[LWOTC])
+        self.assertIsNotNone(lwotc.generate_early)
+        self.assertIsNotNone(lwotc.set_rules)
+        self.assertTrue(lwotc.config)
+        self.assertIs(lwotc.items, mods_data_by_name[LWOTC].items)
+        self.assertIs(lwotc.locations, mods_data_by_name[LWOTC].locations)
+
+        flame_viper = load_mod_hooks(mods_data_by_name[FLAME_VIPER])
+        self.assertIsNone(flame_viper.generate_early)
+        self.assertIsNone(flame_viper.set_rules)
+        self.assertTrue(flame_viper.config)
+
+    def test_only_active_hooks_loaded(self):
+        with patch.object(mods, "load_mod_hooks", wraps=load_mod_hooks) as mock_load_mod_hooks:
+            active_mods_data, inactive_mods_data = get_mods_data(frozenset({FLAME_VIPER}))
+            get_mods_data(frozenset({FLAME_VIPER}))
+        self.assertEqual([call.args[0].name for call in mock_load_mod_hooks.call_args_list], [FLAME_VIPER])
+        self.assertEqual([mod_data.name for mod_data in active_mods_data], [FLAME_VIPER])
+        self.assertTrue(active_mods_data[0].config)
+        self.assertNotIn(FLAME_VIPER, [mod_data.name for mod_data in inactive_mods_data])
+        self.assertTrue(all(not mod_data.config for mod_data in inactive_mods_data))
+
+
+class TestLWOTC(X2WOTCTestBase):
+    options = {
+        "active_mods": {LWOTC},
+    }
+
+    def test_hooks_applied(self):
+        self.assertEqual(type(self.world.rule_manager).__name__, "RuleManager_LW")
+        self.assertFalse(self.world.loc_manager.enabled["UseRocketLauncher"])
@@ -0,0 +1,174 @@
+import asyncio
+import unittest
+
+from NetUtils import NetworkItem, NetworkSlot, SlotType
+
+from .. import Proxy
+from ..Items import item_table
+from ..Version import GAME_NAME
+
+
+class FakeContext:
+    def __init__(self):
+        self.slot = 1
+        self.slot_info = {
+            1: NetworkSlot("Player1", GAME_NAME, SlotType.player),
+            2: NetworkSlot("Player2", "Other Game", SlotType.player),
+        }
+        self.items_received: list[NetworkItem] = []
+        self.checked_locations: set[int] = set()
+        self.connected = asyncio.Event()
+        self.connected.set()
+        self.received_items_event = asyncio.Event()
+        self.sent_checks: list[set[int]] = []
+
+    async def check_locations(self, locations: set[int]):
+        self.sent_checks.append(set(locations))
+        await asyncio.sleep(0.01)
+
+    def receive(self, item_name: str, player: int = 1):
+        self.items_received.append(NetworkItem(item_table[item_name].id, 0, player))
+        self.received_items_event.set()
+        self.received_items_event.clear()
+
+
+class ProxyTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.ctx = FakeContext()
+        Proxy.ctx = self.ctx
+        Proxy.received_items_cache.reset()
+
+
+class TestReceivedItemsCache(ProxyTestCase):
+    async def test_translate_items(self):
+        self.ctx.receive("ProgressiveRifleTechCompleted")
+        self.ctx.receive("Nothing")
+        self.ctx.receive("ProgressiveRifleTechCompleted", player=2)
+        received_items = Proxy.get_received_items("Strategy", 0)
+        self.assertEqual(
+            [item_name for item_name, _, _ in received_items],
+            ["MagnetizedWeaponsCompleted", "PlasmaRifleCompleted"]
+        )
+        self.assertEqual([slot_info.name for _, _, slot_info in received_items], ["Player1", "Player2"])
+        self.assertEqual(Proxy.get_received_items("Strategy", 1), received_items[1:])
+        self.assertEqual(Proxy.get_received_items("Tactical", 0), [])
+
+    async def test_update_incrementally(self):
+        self.ctx.receive("ProgressiveRifleTechCompleted")
+        self.assertTrue(Proxy.has_received_items("Strategy", 0))
+        self.assertFalse(Proxy.has_received_items("Strategy", 1))
+
+        layer_items = Proxy.received_items_cache.layer_items["Strategy"]
+        self.ctx.receive("ProgressiveRifleTechCompleted")
+        self.assertTrue(Proxy.has_received_items("Strategy", 1))
+        self.assertIs(Proxy.received_items_cache.layer_items["Strategy"], layer_items)
+        self.assertEqual(layer_items[1][0], "PlasmaRifleCompleted")
+
+    async def test_rebuild_on_resync(self):
+        self.ctx.receive("ProgressiveRifleTechCompleted")
+        self.ctx.receive("ProgressiveRifleTechCompleted")
+        Proxy.received_items_cache.update()
+
+        # The server resent items from the start into a new list, progressive stages are counted again
+        self.ctx.items_received = self.ctx.items_received[:1]
+        self.assertEqual(
+            [item_name for item_name, _, _ in Proxy.get_received_items("Strategy", 0)],
+            ["MagnetizedWeaponsCompleted"]
+        )
+
+    async def test_tick_responses(self):
+        self.ctx.receive("ProgressiveRifleTechCompleted", player=2)
+        response = Proxy.handle_tick("Strategy", 0)
+        self.assertIn("Player2 (Other Game)", response)
+        self.assertIs(Proxy.handle_tick("Strategy", 0), response)
+        self.assertEqual(Proxy.handle_tick("Strategy", 1), "1")
+
+        self.ctx.receive("ProgressiveRifleTechCompleted")
+        new_response = Proxy.handle_tick("Strategy", 0)
+        self.assertTrue(new_response.startswith(response))
+        self.assertIn("from yourself", new_response)
+
+
+class TestWaitForReceivedItems(ProxyTestCase):
+    async def test_items_already_received(self):
+        self.ctx.receive("ProgressiveRifleTechCompleted")
+        await asyncio.wait_for(Proxy.wait_for_received_items("Strategy", 0, 10.0), 1.0)
+
+    async def test_wake_on_new_items(self):
+        wait_task = asyncio.create_task(Proxy.wait_for_received_items("Strategy", 0, 10.0))
+        await asyncio.sleep(0.01)
+        self.assertFalse(wait_task.done())
+
+        # Items that aren't passed on to the game don't release the request
+        self.ctx.receive("Nothing")
+        await asyncio.sleep(0.01)
+        self.assertFalse(wait_task.done())
+
+        self.ctx.receive("ProgressiveRifleTechCompleted")
+        await asyncio.wait_for(wait_task, 1.0)
+
+    async def test_timeout(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.wait_for(Proxy.wait_for_received_items("Strategy", 0, 0.05), 1.0)
+        self.assertGreaterEqual(loop.time() - start, 0.04)
+
+    async def test_not_connected(self):
+        self.ctx.connected.clear()
+        await asyncio.wait_for(Proxy.wait_for_received_items("Strategy", 0, 10.0), 1.0)
+
+
+class TestCheckBatcher(ProxyTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        Proxy.check_batcher.reset()
+        self.addCleanup(Proxy.check_batcher.reset)
+        check_batch_delay = Proxy.CHECK_BATCH_DELAY
+        Proxy.CHECK_BATCH_DELAY = 0.01
+        self.addCleanup(setattr, Proxy, "CHECK_BATCH_DELAY", check_batch_delay)
+
+    async def wait_for_flush(self):
+        await asyncio.wait_for(Proxy.check_batcher.flush_task, 1.0)
+
+    async def test_batch(self):
+        Proxy.check_batcher.add({1, 2})
+        Proxy.check_batcher.add({3})
+        await self.wait_for_flush()
+        self.assertEqual(self.ctx.sent_checks, [{1, 2, 3}])
+
+        # Already sent or checked locations are skipped
+        self.ctx.checked_locations.add(4)
+        Proxy.check_batcher.add({1, 4})
+        self.assertFalse(Proxy.check_batcher.pending)
+
+    async def test_add_while_sending(self):
+        Proxy.check_batcher.add({1})
+        while not self.ctx.sent_checks:
+            await asyncio.sleep(0)
+
+        # The first batch is still being sent
+        Proxy.check_batcher.add({2})
+        self.assertFalse(Proxy.check_batcher.flush_task.done())
+        await self.wait_for_flush()
+        self.assertEqual(self.ctx.sent_checks, [{1}, {2}])
+        self.assertFalse(Proxy.check_batcher.pending)
+
+    async def test_reset(self):
+        Proxy.check_batcher.add({1})
+        await self.wait_for_flush()
+
+        # After connecting to another room or slot, the same location ids have to be sent again
+        Proxy.check_batcher.reset()
+        Proxy.check_batcher.add({1})
+        await self.wait_for_flush()
+        self.assertEqual(self.ctx.sent_checks, [{1}, {1}])
+
+    async def test_reset_cancels_pending(self):
+        self.ctx.connected.clear()
+        Proxy.check_batcher.add({1})
+        flush_task = Proxy.check_batcher.flush_task
+        Proxy.check_batcher.reset()
+        self.ctx.connected.set()
+        await asyncio.sleep(0.05)
+        self.assertTrue(flush_task.done())
+        self.assertEqual(self.ctx.sent_checks, [])